@@ -0,0 +1,251 @@
+# TodoEvolve Backend - LLM Response Cache
+
+"""
+Response cache placed in front of the chat providers.
+
+Two layers:
+- Exact: sha256 of the full message list. Only used for deterministic
+  (temperature=0) calls, where an identical prompt must give an identical answer.
+- Semantic: embedding of the last user turn, compared by cosine similarity
+  against previous turns that share the same context (every earlier message).
+  A near-match is only a guess, so this layer is bypassed whenever replaying
+  an old answer could act on or report the wrong data (see LLMSemanticCache).
+
+The semantic layer needs `fastembed` + `numpy`; without them only the exact
+layer is active.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Check if the local embedding stack is installed
+try:
+    import numpy as np
+    from fastembed import TextEmbedding
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    np = None
+    TextEmbedding = None
+    SEMANTIC_CACHE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_CHUNK = 1024  # rows added per matrix growth step
+
+CachedResponse = Tuple[str, str]  # (content, provider)
+
+# Prefix of the user turn that feeds a tool's result back to the model (routes/chat.py)
+TOOL_OUTPUT_PREFIX = "Tool Output:"
+
+
+def _is_tool_output(messages: list) -> bool:
+    content = messages[-1].get("content")
+    return isinstance(content, str) and content.startswith(TOOL_OUTPUT_PREFIX)
+
+
+def _hash(payload) -> str:
+    """Stable sha256 of a JSON-serializable payload."""
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+class _ContextBucket:
+    """Embeddings and responses for turns that share one context hash."""
+
+    def __init__(self) -> None:
+        # Preallocated float32 (capacity, dim) matrix with L2-normalized rows;
+        # only the first len(self) rows are live. Grows in EMBEDDING_CHUNK steps
+        # so inserts don't copy the whole matrix each time.
+        self._matrix = None
+        self.values: List[CachedResponse] = []
+        self.expires: List[float] = []
+
+    @property
+    def embeddings(self):
+        """View of the live rows, shape (n, dim)."""
+        return self._matrix[: len(self.values)]
+
+    def add(self, embedding, value: CachedResponse, expires_at: float) -> None:
+        n = len(self.values)
+        if self._matrix is None:
+            self._matrix = np.empty((EMBEDDING_CHUNK, embedding.shape[0]), dtype=np.float32)
+        elif n == self._matrix.shape[0]:
+            grown = np.empty((n + EMBEDDING_CHUNK, self._matrix.shape[1]), dtype=np.float32)
+            grown[:n] = self._matrix
+            self._matrix = grown
+        self._matrix[n] = embedding
+        self.values.append(value)
+        self.expires.append(expires_at)
+
+    def prune(self, now: float) -> None:
+        keep = [i for i, exp in enumerate(self.expires) if exp > now]
+        if len(keep) == len(self.expires):
+            return
+        # Compact live rows to the front; capacity is kept for reuse
+        self._matrix[: len(keep)] = self._matrix[keep]
+        self.values = [self.values[i] for i in keep]
+        self.expires = [self.expires[i] for i in keep]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class LLMSemanticCache:
+    """
+    In-process cache of chat completions.
+
+    Semantic lookups are scoped by a hash of every message except the last
+    one. That context is not always user-specific (a fixed system prompt with
+    no user ID is shared by everyone), so the semantic layer is bypassed for:
+    - tool-call replies: the engine stores them with semantic=False, since a
+      paraphrase may name a different task
+    - tool-output turns (last message starts with TOOL_OUTPUT_PREFIX): fresh
+      data embeds close to stale data, so an old summary would be replayed
+    - callers that pass semantic=False, e.g. the day planner, whose prompt
+      carries no user ID and whose reply is turned into tasks
+    The exact layer still applies to deterministic (temperature=0) calls.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        ttl: float = 3600.0,
+        max_entries: int = 5000,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._exact: Dict[str, Tuple[CachedResponse, float]] = {}
+        self._buckets: Dict[str, _ContextBucket] = {}
+        self._embedder = None
+
+    # ------------------------------------------------------------------
+    # Embedding
+    # ------------------------------------------------------------------
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return SEMANTIC_CACHE_AVAILABLE
+
+    def _embed_sync(self, text: str):
+        if self._embedder is None:
+            logger.info(f"Loading cache embedding model: {EMBEDDING_MODEL}")
+            self._embedder = TextEmbedding(EMBEDDING_MODEL)
+        vec = np.asarray(next(iter(self._embedder.embed([text]))), dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    async def _embed(self, text: str):
+        # Embedding is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._embed_sync, text)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(
+        self,
+        messages: list,
+        temperature: float,
+        semantic: bool = True,
+    ) -> Optional[CachedResponse]:
+        """
+        Return a cached (content, provider) for these messages, if any.
+        With semantic=False only the exact layer is consulted.
+        """
+        if not messages:
+            return None
+        now = time.monotonic()
+
+        if temperature == 0:
+            hit = self._exact.get(_hash(messages))
+            if hit and hit[1] > now:
+                return hit[0]
+
+        if not (semantic and self.semantic_enabled) or _is_tool_output(messages):
+            return None
+
+        bucket = self._buckets.get(_hash(messages[:-1]))
+        if bucket is None or not len(bucket):
+            return None
+
+        try:
+            query = await self._embed(messages[-1].get("content", ""))
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return None
+
+        # One BLAS matrix-vector product over every stored turn (rows are unit length,
+        # so the dot product is the cosine similarity)
+        scores = bucket.embeddings @ query
+        best = int(scores.argmax())
+        if scores[best] >= self.threshold and bucket.expires[best] > now:
+            logger.info(f"Semantic cache hit (similarity={scores[best]:.3f})")
+            return bucket.values[best]
+        return None
+
+    async def set(
+        self,
+        messages: list,
+        temperature: float,
+        value: CachedResponse,
+        semantic: bool = True,
+    ) -> None:
+        """
+        Store a successful provider response.
+        With semantic=False only the exact layer (if applicable) keeps it.
+        """
+        if not messages:
+            return
+        now = time.monotonic()
+        expires_at = now + self.ttl
+
+        if len(self._exact) + self._semantic_size() >= self.max_entries:
+            self._prune(now)
+
+        if temperature == 0:
+            self._exact[_hash(messages)] = (value, expires_at)
+
+        if not (semantic and self.semantic_enabled) or _is_tool_output(messages):
+            return
+
+        try:
+            embedding = await self._embed(messages[-1].get("content", ""))
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed: {e}")
+            return
+
+        context_key = _hash(messages[:-1])
+        self._buckets.setdefault(context_key, _ContextBucket()).add(embedding, value, expires_at)
+
+    def clear(self) -> None:
+        self._exact.clear()
+        self._buckets.clear()
+
+    # ------------------------------------------------------------------
+    # Housekeeping
+    # ------------------------------------------------------------------
+
+    def _semantic_size(self) -> int:
+        return sum(len(b) for b in self._buckets.values())
+
+    def _prune(self, now: float) -> None:
+        """Drop expired entries; if still full, drop the oldest contexts."""
+        self._exact = {k: v for k, v in self._exact.items() if v[1] > now}
+        for key in list(self._buckets):
+            bucket = self._buckets[key]
+            bucket.prune(now)
+            if not len(bucket):
+                del self._buckets[key]
+
+        # dicts keep insertion order, so the first keys are the oldest
+        while self._exact and len(self._exact) + self._semantic_size() >= self.max_entries:
+            self._exact.pop(next(iter(self._exact)))
+        while self._buckets and self._semantic_size() >= self.max_entries:
+            self._buckets.pop(next(iter(self._buckets)))
@@ -1,10 +1,17 @@
 
 import logging
 import asyncio
-from typing import Tuple, Optional
-from openai import AsyncOpenAI
+import random
+import re
+import time
+from typing import Any, AsyncIterator, List, Tuple, Optional
+import httpx
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, RateLimitError
 import google.generativeai as genai
 from ..config import get_settings
+from .cache import LLMSemanticCache
+from .ratelimit import TokenBucket, CircuitBreaker, retry_after_seconds
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
@@ -13,14 +20,27 @@ logger = logging.getLogger(__name__)
 # PROVIDER CONFIGURATION
 # ============================================================================
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Idle connections are kept well past httpx's 5s default, so the next turn of a
+# chat (after a tool call) reuses the TCP+TLS session instead of handshaking again
+_openrouter_http = DefaultAsyncHttpxClient(
+    limits=httpx.Limits(
+        max_connections=settings.openrouter_max_concurrency * 2,
+        max_keepalive_connections=settings.openrouter_max_concurrency,
+        keepalive_expiry=settings.llm_keepalive_expiry,
+    )
+) if settings.open_router_key else None
+
 # Provider 1: OpenRouter (Llama 3.3)
 openrouter_client = AsyncOpenAI(
-    base_url="https://openrouter.ai/api/v1",
+    base_url=OPENROUTER_BASE_URL,
     api_key=settings.open_router_key,
     default_headers={
         "HTTP-Referer": "http://localhost:3000",
         "X-Title": "TodoEvolve"
-    }
+    },
+    http_client=_openrouter_http,
 ) if settings.open_router_key else None
 
 # Updated Model List - Prioritizing reliable standard models over free tier
@@ -31,6 +51,25 @@ OPENROUTER_MODELS = [
     "openai/gpt-4o-mini",                     # Verified fallback
 ]
 
+# Per-model health: failing models are skipped instantly instead of paying a timeout
+_model_breakers = {
+    model: CircuitBreaker(settings.llm_breaker_threshold, settings.llm_breaker_cooldown)
+    for model in OPENROUTER_MODELS
+}
+_model_buckets = {
+    model: TokenBucket(settings.openrouter_rpm, latency_target=settings.llm_latency_target)
+    for model in OPENROUTER_MODELS
+}
+
+# Caps in-flight OpenRouter calls so bursts queue here instead of drawing 429s
+_openrouter_semaphore = asyncio.Semaphore(settings.openrouter_max_concurrency)
+
+# Provider label per model ("openrouter/llama-3.3-70b-instruct"), derived once
+_OPENROUTER_PROVIDER = {
+    model: f"openrouter/{model.split('/')[1].split(':')[0]}"
+    for model in OPENROUTER_MODELS
+}
+
 # Provider 2: Gemini Direct
 if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
@@ -39,77 +78,292 @@ if settings.gemini_api_key:
 else:
     gemini_model = None
 
+_gemini_semaphore = asyncio.Semaphore(settings.gemini_max_concurrency)
+
+# Retry backoff ceiling (seconds)
+MAX_BACKOFF_SECONDS = 30
+
+# Returned (not cached) when every provider fails
+FALLBACK_RESPONSE = (
+    "I'm currently experiencing high demand on my AI services. Please try again in a few minutes.",
+    "fallback"
+)
+
+# Response cache (exact + semantic) in front of both providers
+response_cache = LLMSemanticCache(
+    threshold=settings.llm_cache_threshold,
+    ttl=settings.llm_cache_ttl,
+    max_entries=settings.llm_cache_max_entries,
+) if settings.llm_cache_enabled else None
+
+# ============================================================================
+# CONNECTION MANAGEMENT
+# ============================================================================
+
+async def warm_provider() -> None:
+    """
+    Open (or refresh) a pooled OpenRouter connection ahead of the next call.
+    Meant to run alongside work that precedes an AI turn, e.g. a tool call;
+    failures are ignored since the real request will simply connect itself.
+    """
+    if not _openrouter_http:
+        return
+    try:
+        await _openrouter_http.head(OPENROUTER_BASE_URL, timeout=2.0)
+    except Exception as e:
+        logger.debug(f"OpenRouter warm-up failed: {e}")
+
+
+async def close_llm_clients() -> None:
+    """Close pooled provider connections on shutdown."""
+    if openrouter_client:
+        await openrouter_client.close()
+
+
 # ============================================================================
 # CHAT FUNCTIONS
 # ============================================================================
 
-async def call_openrouter(messages: list) -> Tuple[str, str]:
+async def call_openrouter(messages: list, temperature: float = 0.7) -> Tuple[str, str]:
     """Call OpenRouter API, trying multiple models."""
     if not openrouter_client:
         raise Exception("OpenRouter not configured")
     
     last_error = None
     for model in OPENROUTER_MODELS:
+        if not _openrouter_available(model):
+            continue
+        breaker = _model_breakers[model]
+        bucket = _model_buckets[model]
+        
         try:
             logger.info(f"Trying OpenRouter model: {model}")
-            response = await openrouter_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=0.7
-            )
+            async with _openrouter_semaphore:
+                started = time.monotonic()
+                response = await openrouter_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature
+                )
+            bucket.on_success(time.monotonic() - started)
+            breaker.record_success()
             content = response.choices[0].message.content
-            model_short = model.split('/')[1].split(':')[0]
             logger.info(f"Success with {model}")
-            return content, f"openrouter/{model_short}"
+            return content, _OPENROUTER_PROVIDER[model]
         except Exception as e:
-            logger.warning(f"OpenRouter model {model} failed: {e}")
+            _record_openrouter_failure(model, e)
             last_error = e
             continue
     
+    if last_error is None:
+        raise Exception("All OpenRouter models skipped (circuit open or rate limited)")
     raise last_error or Exception("All OpenRouter models failed")
 
 
-async def call_gemini(messages: list) -> Tuple[str, str]:
-    """Call Gemini API directly."""
-    if not gemini_model:
-        raise Exception("Gemini not configured")
+def _openrouter_available(model: str) -> bool:
+    """Check the model's breaker and rate budget (consumes a token when available)."""
+    if _model_breakers[model].is_open():
+        logger.info(f"Skipping OpenRouter model {model}: circuit open")
+        return False
+    if not _model_buckets[model].try_acquire():
+        logger.info(f"Skipping OpenRouter model {model}: rate budget exhausted")
+        return False
+    return True
+
+
+def _record_openrouter_failure(model: str, error: Exception) -> None:
+    """Update breaker and rate budget after a failed call to `model`."""
+    logger.warning(f"OpenRouter model {model} failed: {error}")
+    breaker = _model_breakers[model]
+    breaker.record_failure()
+    retry_after = retry_after_seconds(error)
+    if isinstance(error, RateLimitError) or retry_after is not None:
+        _model_buckets[model].on_throttle()
+        if retry_after:
+            breaker.open_for(retry_after)
+
+
+async def stream_openrouter(messages: list, temperature: float = 0.7) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Stream an OpenRouter completion as (delta, provider) pairs.
+    Falls through the model list until one starts streaming; an error after
+    the first delta is raised to the caller.
+    """
+    if not openrouter_client:
+        raise Exception("OpenRouter not configured")
     
-    # Convert OpenAI format to Gemini format
-    prompt_parts = []
-    for msg in messages:
-        role = msg.get("role")
-        content = msg.get("content")
-        if role == "system":
-            prompt_parts.append(f"System Instructions:\n{content}\n")
-        elif role == "user":
-            prompt_parts.append(f"User: {content}\n")
-        elif role == "assistant":
-            prompt_parts.append(f"Assistant: {content}\n")
+    last_error = None
+    for model in OPENROUTER_MODELS:
+        if not _openrouter_available(model):
+            continue
+        
+        provider = _OPENROUTER_PROVIDER[model]
+        emitted = False
+        try:
+            logger.info(f"Streaming from OpenRouter model: {model}")
+            # The slot is held for the whole stream, not just the first response
+            async with _openrouter_semaphore:
+                started = time.monotonic()
+                stream = await openrouter_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if not emitted:
+                        # Time to first token drives the adaptive rate budget
+                        _model_buckets[model].on_success(time.monotonic() - started)
+                        emitted = True
+                    yield delta, provider
+            if emitted:
+                _model_breakers[model].record_success()
+                return
+            last_error = Exception(f"OpenRouter model {model} returned an empty stream")
+        except Exception as e:
+            _record_openrouter_failure(model, e)
+            if emitted:
+                raise
+            last_error = e
     
+    if last_error is None:
+        raise Exception("All OpenRouter models skipped (circuit open or rate limited)")
+    raise last_error
+
+
+GEMINI_PROVIDER = "gemini/1.5-flash"
+
+_ROLE_PREFIX = {
+    "system": "System Instructions:\n",
+    "user": "User: ",
+    "assistant": "Assistant: ",
+}
+
+
+def _gemini_prompt(messages: list) -> str:
+    """Convert OpenAI format to a Gemini text prompt (unknown roles are dropped)."""
+    prompt_parts = [
+        f"{_ROLE_PREFIX[msg['role']]}{msg['content']}\n"
+        for msg in messages
+        if msg.get("role") in _ROLE_PREFIX
+    ]
     prompt_parts.append("Assistant:")
-    full_prompt = "\n".join(prompt_parts)
+    return "\n".join(prompt_parts)
+
+
+def _gemini_config(temperature: float):
+    return genai.types.GenerationConfig(
+        temperature=temperature,
+        max_output_tokens=2048
+    )
+
+
+async def call_gemini(messages: list, temperature: float = 0.7) -> Tuple[str, str]:
+    """Call Gemini API directly."""
+    if not gemini_model:
+        raise Exception("Gemini not configured")
     
     # Gemini API call
     try:
-        response = await asyncio.to_thread(
-            gemini_model.generate_content,
-            full_prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.7,
-                max_output_tokens=2048
+        async with _gemini_semaphore:
+            response = await gemini_model.generate_content_async(
+                _gemini_prompt(messages),
+                generation_config=_gemini_config(temperature)
             )
-        )
-        return response.text, "gemini/1.5-flash"
+        return response.text, GEMINI_PROVIDER
     except Exception as e:
         logger.error(f"Gemini API failed: {e}")
         raise e
 
 
-async def dual_provider_chat(messages: list, max_retries: int = 2) -> Tuple[str, str]:
+async def stream_gemini(messages: list, temperature: float = 0.7) -> AsyncIterator[Tuple[str, str]]:
+    """Stream a Gemini completion as (delta, provider) pairs."""
+    if not gemini_model:
+        raise Exception("Gemini not configured")
+    
+    async with _gemini_semaphore:
+        response = await gemini_model.generate_content_async(
+            _gemini_prompt(messages),
+            generation_config=_gemini_config(temperature),
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text, GEMINI_PROVIDER
+
+
+async def _call_provider(provider_name: str, provider_func, messages: list, max_retries: int, temperature: float) -> Tuple[str, str]:
+    """Call one provider with retries. Raises the last error if every attempt fails."""
+    last_error = None
+    
+    for attempt in range(max_retries):
+        try:
+            return await provider_func(messages, temperature)
+            
+        except Exception as e:
+            error_str = str(e).lower()
+            last_error = e
+            logger.warning(f"{provider_name} attempt {attempt+1} failed: {e}")
+            
+            if attempt >= max_retries - 1:
+                break
+            
+            if "429" in str(e) or "rate" in error_str or "quota" in error_str:
+                retry_after = retry_after_seconds(e)
+                if retry_after is None or retry_after > MAX_BACKOFF_SECONDS:
+                    logger.info(f"Rate limit detected on {provider_name}, switching provider...")
+                    break
+                logger.info(f"Rate limit on {provider_name}, retrying after {retry_after}s (Retry-After)")
+                await asyncio.sleep(retry_after)
+                continue
+            
+            # Exponential backoff with jitter avoids synchronized retry storms
+            await asyncio.sleep(min(2 ** attempt + random.uniform(0, 1), MAX_BACKOFF_SECONDS))
+    
+    raise last_error or Exception(f"{provider_name} failed")
+
+
+async def _hedged_chat(messages: list, max_retries: int, temperature: float) -> Tuple[str, str]:
     """
-    Attempt chat with OpenRouter first, fallback to Gemini on failure.
-    Returns (response_text, provider_used).
+    Fire OpenRouter now and Gemini after `llm_hedge_delay` (or as soon as
+    OpenRouter fails). The first successful response wins; the other is cancelled.
     """
+    tasks = {
+        asyncio.create_task(_call_provider("OpenRouter", call_openrouter, messages, max_retries, temperature)): "OpenRouter"
+    }
+    backup_started = False
+    last_error = None
+    
+    try:
+        while tasks:
+            timeout = None if backup_started else settings.llm_hedge_delay
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                provider_name = tasks.pop(task)
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+                logger.warning(f"{provider_name} failed during hedged request: {last_error}")
+            
+            if not backup_started:
+                # Primary is slow or already failed - hedge with the second provider
+                backup_started = True
+                if tasks:
+                    logger.info(f"OpenRouter slower than {settings.llm_hedge_delay}s, hedging with Gemini...")
+                tasks[asyncio.create_task(_call_provider("Gemini", call_gemini, messages, max_retries, temperature))] = "Gemini"
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    raise last_error or Exception("All AI providers failed")
+
+
+async def _sequential_chat(messages: list, max_retries: int, temperature: float) -> Tuple[str, str]:
+    """Try OpenRouter, then Gemini, one after the other."""
     providers = [
         ("OpenRouter", call_openrouter),
         ("Gemini", call_gemini),
@@ -118,62 +372,253 @@ async def dual_provider_chat(messages: list, max_retries: int = 2) -> Tuple[str,
     last_error = None
     
     for provider_name, provider_func in providers:
-        for attempt in range(max_retries):
-            try:
-                content, model_id = await provider_func(messages)
-                return content, model_id
-                
-            except Exception as e:
-                error_str = str(e).lower()
-                last_error = e
-                logger.warning(f"{provider_name} attempt {attempt+1} failed: {e}")
-                
-                if "429" in str(e) or "rate" in error_str or "quota" in error_str:
-                    logger.info(f"Rate limit detected on {provider_name}, switching provider...")
-                    break
-                
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(1 * (attempt + 1))
-    
-    logger.error(f"All AI providers failed. Last error: {last_error}")
+        try:
+            return await _call_provider(provider_name, provider_func, messages, max_retries, temperature)
+        except Exception as e:
+            last_error = e
     
-    return (
-        "I'm currently experiencing high demand on my AI services. Please try again in a few minutes.",
-        "fallback"
+    raise last_error or Exception("All AI providers failed")
+
+
+def _hedging_enabled() -> bool:
+    """Hedging doubles provider spend on slow calls, so production must opt in."""
+    if settings.llm_hedge_delay <= 0:
+        return False
+    return settings.llm_hedge_in_production or not settings.is_production
+
+
+async def _cache_response(
+    messages: list, temperature: float, content: str, provider: str, semantic: bool = True
+) -> None:
+    """
+    Store a reply in the response cache. Tool calls stay out of the semantic
+    layer: "delete task 5" and "delete task 6" embed as near-duplicates, and
+    replaying the cached call would act on the wrong task.
+    """
+    await response_cache.set(
+        messages, temperature, (content, provider),
+        semantic=semantic and extract_tool_call(content) is None
     )
 
 
-def extract_json(text: str) -> Optional[dict]:
-    """Attempt to extract JSON from text, handling markdown and mixed content."""
-    import json
-    import re
+async def dual_provider_chat(
+    messages: list,
+    max_retries: Optional[int] = None,
+    temperature: float = 0.7,
+    semantic_cache: bool = True,
+) -> Tuple[str, str]:
+    """
+    Attempt chat with OpenRouter first, fallback to Gemini on failure.
+    When hedging is enabled, a slow OpenRouter call also starts Gemini and
+    the faster of the two wins.
+    Serves repeat/paraphrased prompts from the response cache when possible;
+    semantic_cache=False limits that to exact repeats, for callers whose
+    context isn't user-specific.
+    Returns (response_text, provider_used).
+    """
+    if max_retries is None:
+        max_retries = settings.llm_max_retries
+    
+    if response_cache:
+        cached = await response_cache.get(messages, temperature, semantic=semantic_cache)
+        if cached:
+            return cached
+    
+    chat_strategy = _hedged_chat if _hedging_enabled() else _sequential_chat
     
-    # 1. Try parsing the whole text
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
+        content, model_id = await chat_strategy(messages, max_retries, temperature)
+    except Exception as e:
+        logger.error(f"All AI providers failed. Last error: {e}")
+        return FALLBACK_RESPONSE
+    
+    if response_cache:
+        await _cache_response(messages, temperature, content, model_id, semantic=semantic_cache)
+    return content, model_id
 
-    # 2. Extract from Markdown code blocks
-    try:
-        if "```json" in text:
-            block = text.split("```json")[1].split("```")[0].strip()
-            return json.loads(block)
-        elif "```" in text:
-            block = text.split("```")[1].split("```")[0].strip()
-            return json.loads(block)
-    except Exception:
-        pass
-        
-    # 3. Regex search for JSON object
-    # This regex looks for the outermost curly braces
-    try:
-        match = re.search(r'(\{.*\})', text, re.DOTALL)
-        if match:
-            json_str = match.group(1)
-            return json.loads(json_str)
-    except Exception:
-        pass
 
-    return None
+async def dual_provider_stream(messages: list, temperature: float = 0.7) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Streaming counterpart of dual_provider_chat. Yields (delta, provider_used).
+    Providers are tried in order until one produces its first delta; there are
+    no retries or hedging, since either would hold back the first token.
+    The joined stream is stored in the response cache once it completes.
+    """
+    if response_cache:
+        cached = await response_cache.get(messages, temperature)
+        if cached:
+            yield cached
+            return
+    
+    parts: List[str] = []
+    provider = None
+    last_error = None
+    for provider_name, stream_func in (("OpenRouter", stream_openrouter), ("Gemini", stream_gemini)):
+        try:
+            async for delta, provider in stream_func(messages, temperature):
+                parts.append(delta)
+                yield delta, provider
+        except Exception as e:
+            if parts:
+                # Already streamed part of an answer - can't switch provider now
+                logger.error(f"{provider_name} stream failed mid-response: {e}")
+                raise
+            logger.warning(f"{provider_name} stream failed: {e}")
+            last_error = e
+            continue
+        if parts:
+            break
+    
+    if not parts:
+        logger.error(f"All AI providers failed. Last error: {last_error}")
+        yield FALLBACK_RESPONSE
+        return
+    
+    if response_cache:
+        await _cache_response(messages, temperature, "".join(parts), provider)
+
+
+# ============================================================================
+# JSON EXTRACTION
+# ============================================================================
+
+_JSON_OPENERS = {"{": "}", "[": "]"}
+_STRUCTURAL_RE = re.compile(r'[{}\[\]"\\]')
+_FENCE_JSON = "```json"
+
+
+def _find_json_span(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Find the first balanced {...} or [...] at or after `start`.
+    Braces inside JSON strings (including escaped quotes) are ignored.
+    Returns (begin, end) slice indices, or None if no complete span exists.
+    """
+    # The precompiled regex jumps straight between structural characters,
+    # so runs of prose and string contents are skipped in C.
+    search = _STRUCTURAL_RE.search
+    depth = 0
+    begin = -1
+    closer = opener = ""
+    in_string = False
+    pos = start
+    
+    while True:
+        match = search(text, pos)
+        if match is None:
+            return None
+        i = match.start()
+        ch = text[i]
+        pos = i + 1
+        if depth == 0:
+            if ch in _JSON_OPENERS:
+                opener, closer = ch, _JSON_OPENERS[ch]
+                begin = i
+                depth = 1
+            continue
+        if in_string:
+            if ch == "\\":
+                pos = i + 2  # skip the escaped character
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
 
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    Attempt to extract JSON from text, handling markdown and mixed content.
+    Returns the first JSON object/array that parses, or None.
+    """
+    if not text:
+        return None
+    
+    # Start inside a ```json fence if there is one, otherwise scan from the top
+    pos = text.find(_FENCE_JSON)
+    pos = pos + len(_FENCE_JSON) if pos != -1 else 0
+    
+    while True:
+        span = _find_json_span(text, pos)
+        if span is None:
+            return None
+        try:
+            return orjson.loads(text[span[0]:span[1]])
+        except orjson.JSONDecodeError:
+            # Balanced but not valid JSON (e.g. "{placeholder}" in prose) - keep looking
+            pos = span[0] + 1
+
+
+def extract_tool_call(text: str) -> Optional[dict]:
+    """
+    Return the {"tool": ..., "arguments": ...} object in an AI reply, or None.
+    Most final replies are plain prose, so a substring check skips the JSON scan.
+    """
+    if not text or '"tool"' not in text:
+        return None
+    data = extract_json(text)
+    return data if isinstance(data, dict) else None
+
+
+class IncrementalJsonParser:
+    """
+    Extract the first JSON object/array from a stream of text chunks.
+    Scanner state is kept between feed() calls, so each character is examined once
+    no matter how many deltas arrive (instead of re-running extract_json per delta).
+    """
+    
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self._pos = 0          # absolute index of the next unscanned character
+        self._begin = -1       # absolute index of the current opener
+        self._opener = ""
+        self._closer = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.result: Optional[Any] = None
+    
+    def feed(self, chunk: str) -> Optional[Any]:
+        """Consume a chunk. Returns the parsed value once the first complete JSON value closes."""
+        if self.result is not None:
+            return self.result
+        offset = self._pos
+        self._chunks.append(chunk)
+        
+        for ch in chunk:
+            index = offset
+            offset += 1
+            if self._depth == 0:
+                if ch in _JSON_OPENERS:
+                    self._opener, self._closer = ch, _JSON_OPENERS[ch]
+                    self._begin = index
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == self._opener:
+                self._depth += 1
+            elif ch == self._closer:
+                self._depth -= 1
+                if self._depth == 0:
+                    text = "".join(self._chunks)
+                    self._chunks = [text]
+                    try:
+                        self.result = orjson.loads(text[self._begin:index + 1])
+                        return self.result
+                    except orjson.JSONDecodeError:
+                        pass  # not JSON after all - keep scanning
+        
+        self._pos = offset
+        return None
@@ -1,407 +1,523 @@
-from typing import Any, List, Optional
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
-from sqlmodel import Session, select, col
-from app.database import engine
+from sqlmodel import select, col, update, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import async_engine
 from app.models import Task
 from app.config import get_settings
-import json
+from app.redis_client import get_redis
+import httpx
+import orjson
 
 # Initialize MCP Server
 app_mcp = Server("todo-evolve-mcp")
 
+# Shared HTTP client for external tool APIs (keeps pooled HTTP/2 connections alive)
+_HTTP = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    timeout=10.0
+)
 
-@app_mcp.list_tools()
-async def list_tools() -> List[Tool]:
-    return [
-        Tool(
-            name="add_task",
-            description="Create a new task",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "title": { "type": "string", "description": "Task title" },
-                    "description": { "type": "string", "description": "Task description" },
-                    "priority": { "type": "string", "enum": ["high", "medium", "low"] },
-                    "tags": { "type": "array", "items": { "type": "string" } }
-                },
-                "required": ["title"]
-            }
-        ),
-        Tool(
-            name="list_tasks",
-            description="List current tasks",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "status": { "type": "string", "enum": ["all", "pending", "completed"] },
-                    "limit": { "type": "integer", "default": 20 }
-                }
-            }
-        ),
-        Tool(
-            name="complete_task",
-            description="Mark a task as complete or incomplete",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": { "type": "integer", "description": "ID of task to toggle" },
-                    "completed": { "type": "boolean", "description": "True to mark complete, False for incomplete" }
-                },
-                "required": ["task_id"]
-            }
-        ),
-        Tool(
-            name="bulk_complete_tasks",
-            description="Mark multiple tasks as complete or incomplete",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_ids": { "type": "array", "items": { "type": "integer" }, "description": "List of task IDs" },
-                    "completed": { "type": "boolean", "description": "True to mark complete, False to mark incomplete" }
-                },
-                "required": ["task_ids"]
-            }
-        ),
-        Tool(
-            name="delete_task",
-            description="Delete a task by ID or title",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": { "type": "integer", "description": "ID of task to delete" },
-                    "title": { "type": "string", "description": "Title of task to delete (fuzzy match)" }
-                }
-            }
-        ),
-        Tool(
-            name="bulk_delete_tasks",
-            description="Delete multiple tasks by ID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_ids": { "type": "array", "items": { "type": "integer" }, "description": "List of task IDs to delete" }
-                },
-                "required": ["task_ids"]
-            }
-        ),
-        Tool(
-            name="update_task",
-            description="Update a task's title, description, or priority",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": { "type": "integer", "description": "ID of task to update" },
-                    "title": { "type": "string", "description": "New title" },
-                    "description": { "type": "string", "description": "New description" },
-                    "priority": { "type": "string", "enum": ["high", "medium", "low"] }
-                },
-                "required": ["task_id"]
-            }
-        ),
-        Tool(
-            name="get_weather",
-            description="Get current weather for a city",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "city": { "type": "string", "description": "City name (e.g. Karachi, London)" }
-                },
-                "required": ["city"]
-            }
-        ),
-        Tool(
-            name="plan_day",
-            description="Intelligently plan the day and create multiple tasks based on user request",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "request": { "type": "string", "description": "User's request (e.g., 'Plan my day with gym at 9 and work at 10')" }
-                },
-                "required": ["request"]
-            }
-        ),
-        Tool(
-            name="detect_language",
-            description="Detect language of text (ur/en)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": { "type": "string", "description": "Text to analyze" }
-                },
-                "required": ["text"]
-            }
-        ),
-        Tool(
-            name="suggest_priority",
-            description="Suggest priority based on content",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": { "type": "string", "description": "Task description or context" }
-                },
-                "required": ["text"]
-            }
-        ),
-        Tool(
-            name="schedule_reminder",
-            description="Parse recurrence or due dates",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "text": { "type": "string", "description": "Time-related text (tomorrow, next week)" }
-                },
-                "required": ["text"]
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on app shutdown)."""
+    await _HTTP.aclose()
+
+
+logger = logging.getLogger(__name__)
+
+# Skill executors, imported on first use (app.skills pulls in the AI engine)
+_SKILLS: Optional[Dict[str, Callable[..., Any]]] = None
+
+
+def get_skills() -> Dict[str, Callable[..., Any]]:
+    """Return SKILL_EXECUTORS (name -> bound execute), importing app.skills on the first call."""
+    global _SKILLS
+    if _SKILLS is None:
+        from app.skills import SKILL_EXECUTORS
+        _SKILLS = SKILL_EXECUTORS
+    return _SKILLS
+
+# Geocoding cache: city.strip().lower() -> (lat, lon, city_name).
+# City coordinates never change, so entries only leave on LRU eviction.
+_GEO_CACHE: Dict[str, Tuple[float, float, str]] = {}
+_GEO_CACHE_MAX = 2048
+_GEO_REDIS_TTL = 30 * 24 * 3600  # 30 days
+
+# WMO weather interpretation codes (as returned by Open-Meteo)
+_WMO_CODES: Dict[int, str] = {
+    0: "Clear sky",
+    1: "Partly cloudy", 2: "Partly cloudy", 3: "Partly cloudy",
+    45: "Foggy", 48: "Foggy",
+    51: "Drizzle", 53: "Drizzle", 55: "Drizzle", 56: "Drizzle", 57: "Drizzle",
+    61: "Rain", 63: "Rain", 65: "Rain", 66: "Rain", 67: "Rain",
+    71: "Snow", 73: "Snow", 75: "Snow", 77: "Snow",
+    80: "Showers", 81: "Showers", 82: "Showers",
+    85: "Snow showers", 86: "Snow showers",
+    95: "Thunderstorm", 96: "Thunderstorm", 99: "Thunderstorm",
+}
+
+
+async def _geocode(city: str) -> Optional[Tuple[float, float, str]]:
+    """Resolve a city name to (lat, lon, name), using the in-process and Redis caches."""
+    key = city.strip().lower()
+    hit = _GEO_CACHE.pop(key, None)
+    if hit is not None:
+        _GEO_CACHE[key] = hit  # move to most-recent
+        return hit
+
+    redis = get_redis()
+    if redis is not None:
+        try:
+            cached = await redis.get(f"geo:{key}")
+            if cached:
+                lat, lon, name = orjson.loads(cached)
+                hit = (lat, lon, name)
+        except Exception as e:
+            logger.warning(f"Redis geocode lookup failed: {e}")
+
+    if hit is None:
+        geo_resp = await _HTTP.get(
+            "https://geocoding-api.open-meteo.com/v1/search",
+            params={"name": city, "count": 1, "language": "en", "format": "json"}
+        )
+        geo_data = geo_resp.json()
+        if not geo_data.get("results"):
+            return None
+        location = geo_data["results"][0]
+        hit = (location["latitude"], location["longitude"], location["name"])
+        if redis is not None:
+            try:
+                await redis.set(f"geo:{key}", orjson.dumps(hit), ex=_GEO_REDIS_TTL)
+            except Exception as e:
+                logger.warning(f"Redis geocode store failed: {e}")
+
+    if len(_GEO_CACHE) >= _GEO_CACHE_MAX:
+        _GEO_CACHE.pop(next(iter(_GEO_CACHE)))
+    _GEO_CACHE[key] = hit
+    return hit
+
+
+# Static tool catalog - built once at import
+TOOLS: List[Tool] = [
+    Tool(
+        name="add_task",
+        description="Create a new task",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "title": { "type": "string", "description": "Task title" },
+                "description": { "type": "string", "description": "Task description" },
+                "priority": { "type": "string", "enum": ["high", "medium", "low"] },
+                "tags": { "type": "array", "items": { "type": "string" } }
+            },
+            "required": ["title"]
+        }
+    ),
+    Tool(
+        name="list_tasks",
+        description="List current tasks",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "status": { "type": "string", "enum": ["all", "pending", "completed"] },
+                "limit": { "type": "integer", "default": 20 }
             }
-        ),
-        Tool(
-            name="get_deployment_blueprint",
-            description="Get K8s deployment YAML",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "type": { "type": "string", "description": "Blueprint type (minimal, scale)" }
-                },
-                "required": ["type"]
+        }
+    ),
+    Tool(
+        name="complete_task",
+        description="Mark a task as complete or incomplete",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": { "type": "integer", "description": "ID of task to toggle" },
+                "completed": { "type": "boolean", "description": "True to mark complete, False for incomplete" }
+            },
+            "required": ["task_id"]
+        }
+    ),
+    Tool(
+        name="bulk_complete_tasks",
+        description="Mark multiple tasks as complete or incomplete",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_ids": { "type": "array", "items": { "type": "integer" }, "description": "List of task IDs" },
+                "completed": { "type": "boolean", "description": "True to mark complete, False to mark incomplete" }
+            },
+            "required": ["task_ids"]
+        }
+    ),
+    Tool(
+        name="delete_task",
+        description="Delete a task by ID or title",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": { "type": "integer", "description": "ID of task to delete" },
+                "title": { "type": "string", "description": "Title of task to delete (fuzzy match)" }
             }
-        )
-    ]
+        }
+    ),
+    Tool(
+        name="bulk_delete_tasks",
+        description="Delete multiple tasks by ID",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_ids": { "type": "array", "items": { "type": "integer" }, "description": "List of task IDs to delete" }
+            },
+            "required": ["task_ids"]
+        }
+    ),
+    Tool(
+        name="update_task",
+        description="Update a task's title, description, or priority",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": { "type": "integer", "description": "ID of task to update" },
+                "title": { "type": "string", "description": "New title" },
+                "description": { "type": "string", "description": "New description" },
+                "priority": { "type": "string", "enum": ["high", "medium", "low"] }
+            },
+            "required": ["task_id"]
+        }
+    ),
+    Tool(
+        name="get_weather",
+        description="Get current weather for a city",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "city": { "type": "string", "description": "City name (e.g. Karachi, London)" }
+            },
+            "required": ["city"]
+        }
+    ),
+    Tool(
+        name="plan_day",
+        description="Intelligently plan the day and create multiple tasks based on user request",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "request": { "type": "string", "description": "User's request (e.g., 'Plan my day with gym at 9 and work at 10')" }
+            },
+            "required": ["request"]
+        }
+    ),
+    Tool(
+        name="detect_language",
+        description="Detect language of text (ur/en)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": { "type": "string", "description": "Text to analyze" }
+            },
+            "required": ["text"]
+        }
+    ),
+    Tool(
+        name="suggest_priority",
+        description="Suggest priority based on content",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": { "type": "string", "description": "Task description or context" }
+            },
+            "required": ["text"]
+        }
+    ),
+    Tool(
+        name="schedule_reminder",
+        description="Parse recurrence or due dates",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": { "type": "string", "description": "Time-related text (tomorrow, next week)" }
+            },
+            "required": ["text"]
+        }
+    ),
+    Tool(
+        name="get_deployment_blueprint",
+        description="Get K8s deployment YAML",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "type": { "type": "string", "description": "Blueprint type (minimal, scale)" }
+            },
+            "required": ["type"]
+        }
+    )
+]
 
-# Helper for Chat Router
-def get_tool_definitions(tools: List[Tool]) -> str:
-    """Convert tools list to a string definition for the system prompt."""
+
+@app_mcp.list_tools()
+async def list_tools() -> List[Tool]:
+    return TOOLS
+
+
+def _build_tool_definitions(tools: List[Tool]) -> str:
     defs = []
     for t in tools:
         defs.append(f"Tool: {t.name}")
         defs.append(f"Description: {t.description}")
-        defs.append(f"Input Schema: {json.dumps(t.inputSchema)}")
+        defs.append(f"Input Schema: {orjson.dumps(t.inputSchema).decode()}")
         defs.append("---")
     return "\n".join(defs)
 
 
-# Main Logic used by both MCP Server and Chat Router
-async def handle_tool_call(name: str, arguments: Any, user_id: str, session: Session) -> Any:
-    """Execute tool logic with provided session and user context."""
+# System-prompt fragment for the static catalog, serialized once
+TOOL_DEFINITIONS: str = _build_tool_definitions(TOOLS)
+
+
+# Helper for Chat Router
+def get_tool_definitions(tools: List[Tool]) -> str:
+    """Convert tools list to a string definition for the system prompt."""
+    if tools is TOOLS:
+        return TOOL_DEFINITIONS
+    return _build_tool_definitions(tools)
+
+
+# --- Tool handlers: (arguments, user_id, session) -> result dict ---
+
+async def _add_task(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    title = arguments.get("title")
+    desc = arguments.get("description", "")
+    priority = arguments.get("priority", "medium")
+    tags = arguments.get("tags", [])
     
-    if name == "add_task":
-        title = arguments.get("title")
-        desc = arguments.get("description", "")
-        priority = arguments.get("priority", "medium")
-        tags = arguments.get("tags", [])
-        
-        task = Task(
-            title=title, 
-            description=desc, 
-            priority=priority, 
-            tags=tags,
-            user_id=user_id
-        )
-        session.add(task)
-        session.commit()
-        session.refresh(task)
-        return {"status": "success", "message": f"Task created: '{task.title}' with {task.priority} priority (ID: {task.id})", "task": task.model_dump()}
-
-    elif name == "list_tasks":
-        status = arguments.get("status", "all")
-        limit = arguments.get("limit", 20)
-        
-        query = select(Task).where(Task.user_id == user_id)
-        if status == "pending":
-            query = query.where(Task.completed == False)
-        elif status == "completed":
-            query = query.where(Task.completed == True)
-            
-        tasks = session.exec(query.limit(limit)).all()
-        
-        if not tasks:
-            return {"status": "success", "message": "No tasks found.", "tasks": []}
-        
-        task_list = [t.model_dump() for t in tasks]
-        return {"status": "success", "message": f"Found {len(tasks)} tasks.", "tasks": task_list}
+    task = Task(
+        title=title, 
+        description=desc, 
+        priority=priority, 
+        tags=tags,
+        user_id=user_id
+    )
+    session.add(task)
+    await session.commit()
+    await session.refresh(task)
+    return {"status": "success", "message": f"Task created: '{task.title}' with {task.priority} priority (ID: {task.id})", "task": task.model_dump()}
 
-    elif name == "complete_task":
-        task_id = arguments.get("task_id")
-        completed = arguments.get("completed", True)
-        
-        task = session.get(Task, task_id)
-        if not task or task.user_id != user_id:
-            return {"status": "error", "message": f"Task with ID {task_id} not found."}
-        
-        task.completed = completed
-        session.add(task)
-        session.commit()
-        status_text = "completed" if completed else "marked as pending"
-        return {"status": "success", "message": f"Task '{task.title}' has been {status_text}."}
-
-    elif name == "bulk_complete_tasks":
-        task_ids = arguments.get("task_ids", [])
-        completed = arguments.get("completed", True)
-        
-        if not task_ids:
-             return {"status": "error", "message": "No task IDs provided."}
 
-        # Select tasks that match IDs AND user_id
-        query = select(Task).where(col(Task.id).in_(task_ids), Task.user_id == user_id)
-        tasks = session.exec(query).all()
-        
-        if not tasks:
-             return {"status": "error", "message": "No valid tasks found."}
-
-        count = 0
-        for t in tasks:
-            t.completed = completed
-            session.add(t)
-            count += 1
-        session.commit()
+async def _list_tasks(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    status = arguments.get("status", "all")
+    limit = arguments.get("limit", 20)
+    
+    query = select(Task).where(Task.user_id == user_id)
+    if status == "pending":
+        query = query.where(Task.completed == False)
+    elif status == "completed":
+        query = query.where(Task.completed == True)
         
-        status_text = "completed" if completed else "marked as pending"
-        return {"status": "success", "message": f"{count} tasks {status_text}."}
+    tasks = (await session.exec(query.limit(limit))).all()
+    
+    if not tasks:
+        return {"status": "success", "message": "No tasks found.", "tasks": []}
+    
+    task_list = [t.model_dump() for t in tasks]
+    return {"status": "success", "message": f"Found {len(tasks)} tasks.", "tasks": task_list}
 
-    elif name == "delete_task":
-        task_id = arguments.get("task_id")
-        title_match = arguments.get("title")
-        
-        task = None
-        if task_id:
-            task = session.get(Task, task_id)
-            if task and task.user_id != user_id:
-                task = None # Security check
-        elif title_match:
-            query = select(Task).where(Task.user_id == user_id, Task.title.ilike(f"%{title_match}%"))
-            task = session.exec(query).first()
-        else:
-            return {"status": "error", "message": "Please provide either task_id or title to delete."}
+
+async def _complete_task(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    task_id = arguments.get("task_id")
+    completed = arguments.get("completed", True)
+    
+    task = await session.get(Task, task_id)
+    if not task or task.user_id != user_id:
+        return {"status": "error", "message": f"Task with ID {task_id} not found."}
+    
+    task.completed = completed
+    session.add(task)
+    await session.commit()
+    status_text = "completed" if completed else "marked as pending"
+    return {"status": "success", "message": f"Task '{task.title}' has been {status_text}."}
+
+
+async def _bulk_complete_tasks(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    task_ids = arguments.get("task_ids", [])
+    completed = arguments.get("completed", True)
+    
+    if not task_ids:
+        return {"status": "error", "message": "No task IDs provided."}
+
+    # Single UPDATE scoped to IDs AND user_id
+    statement = (
+        update(Task)
+        .where(col(Task.id).in_(task_ids), Task.user_id == user_id)
+        .values(completed=completed)
+    )
+    count = (await session.exec(statement)).rowcount
+    await session.commit()
+    
+    if not count:
+        return {"status": "error", "message": "No valid tasks found."}
+    
+    status_text = "completed" if completed else "marked as pending"
+    return {"status": "success", "message": f"{count} tasks {status_text}."}
+
+
+async def _delete_task(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    task_id = arguments.get("task_id")
+    title_match = arguments.get("title")
+    
+    task = None
+    if task_id:
+        task = await session.get(Task, task_id)
+        if task and task.user_id != user_id:
+            task = None # Security check
+    elif title_match:
+        query = select(Task).where(Task.user_id == user_id, Task.title.ilike(f"%{title_match}%"))
+        task = (await session.exec(query)).first()
+    else:
+        return {"status": "error", "message": "Please provide either task_id or title to delete."}
+    
+    if not task:
+        return {"status": "error", "message": "Task not found."}
+    
+    task_title = task.title
+    await session.delete(task)
+    await session.commit()
+    return {"status": "success", "message": f"Task '{task_title}' has been deleted."}
+
+
+async def _bulk_delete_tasks(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    task_ids = arguments.get("task_ids", [])
+    if not task_ids:
+        return {"status": "error", "message": "No task IDs provided."}
+    
+    # Single DELETE scoped to IDs AND user_id
+    statement = delete(Task).where(col(Task.id).in_(task_ids), Task.user_id == user_id)
+    count = (await session.exec(statement)).rowcount
+    await session.commit()
+    
+    if not count:
+        return {"status": "error", "message": "No valid tasks found to delete."}
+    
+    return {"status": "success", "message": f"Deleted {count} tasks."}
+
+
+async def _update_task(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    task_id = arguments.get("task_id")
+    
+    task = await session.get(Task, task_id)
+    if not task or task.user_id != user_id:
+        return {"status": "error", "message": f"Task with ID {task_id} not found."}
+    
+    if "title" in arguments:
+        task.title = arguments["title"]
+    if "description" in arguments:
+        task.description = arguments["description"]
+    if "priority" in arguments:
+        task.priority = arguments["priority"]
+    
+    session.add(task)
+    await session.commit()
+    return {"status": "success", "message": f"Task #{task.id} has been updated: '{task.title}' ({task.priority})"}
+
+
+async def _get_weather(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    city = arguments.get("city")
+    if not city:
+        return {"status": "error", "message": "City name is required."}
+    
+    try:
+        # 1. Geocode (cached)
+        location = await _geocode(city)
+        if location is None:
+            return {"status": "error", "message": f"City '{city}' not found."}
         
-        if not task:
-            return {"status": "error", "message": "Task not found."}
+        lat, lon, city_name = location
         
-        task_title = task.title
-        session.delete(task)
-        session.commit()
-        return {"status": "success", "message": f"Task '{task_title}' has been deleted."}
-
-    elif name == "bulk_delete_tasks":
-        task_ids = arguments.get("task_ids", [])
-        if not task_ids:
-             return {"status": "error", "message": "No task IDs provided."}
+        # 2. Forecast
+        url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,weather_code"
+        weather_resp = await _HTTP.get(url)
+        weather_data = weather_resp.json()
         
-        query = select(Task).where(col(Task.id).in_(task_ids), Task.user_id == user_id)
-        tasks = session.exec(query).all()
+        temp = weather_data["current"]["temperature_2m"]
+        code = weather_data["current"]["weather_code"]
+        unit = weather_data["current_units"]["temperature_2m"]
         
-        if not tasks:
-             return {"status": "error", "message": "No valid tasks found to delete."}
-             
-        count = 0
-        for t in tasks:
-            session.delete(t)
-            count += 1
-        session.commit()
+        desc = _WMO_CODES.get(code, "Clear sky")
         
-        return {"status": "success", "message": f"Deleted {count} tasks."}
+        return {"status": "success", "message": f"Current weather in {city_name}: {temp}{unit}, {desc}", "data": {"temp": temp, "desc": desc}}
+    except Exception as e:
+        return {"status": "error", "message": f"Failed to fetch weather: {str(e)}"}
 
-    elif name == "update_task":
-        task_id = arguments.get("task_id")
-        
-        task = session.get(Task, task_id)
-        if not task or task.user_id != user_id:
-            return {"status": "error", "message": f"Task with ID {task_id} not found."}
-        
-        if "title" in arguments:
-            task.title = arguments["title"]
-        if "description" in arguments:
-            task.description = arguments["description"]
-        if "priority" in arguments:
-            task.priority = arguments["priority"]
-        
-        session.add(task)
-        session.commit()
-        return {"status": "success", "message": f"Task #{task.id} has been updated: '{task.title}' ({task.priority})"}
-
-    elif name == "get_weather":
-        city = arguments.get("city")
-        if not city:
-             return {"status": "error", "message": "City name is required."}
-        
-        try:
-            import httpx
-            async with httpx.AsyncClient() as client:
-                # 1. Geocode
-                geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1&language=en&format=json"
-                geo_resp = await client.get(geo_url)
-                geo_data = geo_resp.json()
-                
-                if not geo_data.get("results"):
-                     return {"status": "error", "message": f"City '{city}' not found."}
-                
-                location = geo_data["results"][0]
-                lat = location["latitude"]
-                lon = location["longitude"]
-                city_name = location["name"]
-                
-                # 2. Forecast
-                url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,weather_code"
-                weather_resp = await client.get(url)
-                weather_data = weather_resp.json()
-                
-                temp = weather_data["current"]["temperature_2m"]
-                code = weather_data["current"]["weather_code"]
-                unit = weather_data["current_units"]["temperature_2m"]
-                
-                # Code mapping
-                desc = "Clear sky"
-                if code in [1, 2, 3]: desc = "Partly cloudy"
-                elif code in [45, 48]: desc = "Foggy"
-                elif code in [51, 53, 55, 56, 57]: desc = "Drizzle"
-                elif code in [61, 63, 65, 66, 67]: desc = "Rain"
-                elif code in [71, 73, 75, 77]: desc = "Snow"
-                elif code >= 80: desc = "Showers/Thunderstorm"
-                
-                return {"status": "success", "message": f"Current weather in {city_name}: {temp}{unit}, {desc}", "data": {"temp": temp, "desc": desc}}
-        except Exception as e:
-             return {"status": "error", "message": f"Failed to fetch weather: {str(e)}"}
-
-    # --- Agent Skills (All Async) ---
-    elif name == "detect_language":
-        from app.skills import AVAILABLE_SKILLS
-        text = arguments.get("text", "")
-        # Await async execution
-        result = await AVAILABLE_SKILLS["lang_detector"].execute(text, user_id=user_id, session=session)
-        return {"status": "success", "language": result}
-
-    elif name == "suggest_priority":
-        from app.skills import AVAILABLE_SKILLS
-        text = arguments.get("text", "")
-        result = await AVAILABLE_SKILLS["priority_suggester"].execute(text, user_id=user_id, session=session)
-        return {"status": "success", "priority": result}
-
-    elif name == "schedule_reminder":
-        from app.skills import AVAILABLE_SKILLS
-        text = arguments.get("text", "")
-        result = await AVAILABLE_SKILLS["reminder_scheduler"].execute(text, user_id=user_id, session=session)
-        return {"status": "success", "reminder_date": result.isoformat() if result else None}
-
-    elif name == "get_deployment_blueprint":
-        from app.skills import AVAILABLE_SKILLS
-        type_ = arguments.get("type", "minimal")
-        result = await AVAILABLE_SKILLS["deployment_blueprint"].execute(type_, user_id=user_id, session=session)
-        return {"status": "success", "blueprint": result}
-
-    elif name == "plan_day":
-        from app.skills import AVAILABLE_SKILLS
-        request = arguments.get("request", "")
-        result = await AVAILABLE_SKILLS["day_planner"].execute(request, user_id=user_id, session=session)
-        return {"status": "success", "message": result}
-
-    raise ValueError(f"Tool not found: {name}")
+
+# --- Agent Skills (day_planner is async; the text-only skills are sync) ---
+
+async def _detect_language(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    text = arguments.get("text", "")
+    result = get_skills()["lang_detector"](text, user_id=user_id, session=session)
+    return {"status": "success", "language": result}
+
+
+async def _suggest_priority(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    text = arguments.get("text", "")
+    result = get_skills()["priority_suggester"](text, user_id=user_id, session=session)
+    return {"status": "success", "priority": result}
+
+
+async def _schedule_reminder(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    text = arguments.get("text", "")
+    result = get_skills()["reminder_scheduler"](text, user_id=user_id, session=session)
+    return {"status": "success", "reminder_date": result.isoformat() if result else None}
+
+
+async def _get_deployment_blueprint(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    type_ = arguments.get("type", "minimal")
+    result = get_skills()["deployment_blueprint"](type_, user_id=user_id, session=session)
+    return {"status": "success", "blueprint": result}
+
+
+async def _plan_day(arguments: Any, user_id: str, session: AsyncSession) -> Dict[str, Any]:
+    request = arguments.get("request", "")
+    result = await get_skills()["day_planner"](request, user_id=user_id, session=session)
+    return {"status": "success", "message": result}
+
+
+ToolHandler = Callable[[Any, str, AsyncSession], Awaitable[Dict[str, Any]]]
+
+# Tool name -> handler, looked up once per call
+_HANDLERS: Dict[str, ToolHandler] = {
+    "add_task": _add_task,
+    "list_tasks": _list_tasks,
+    "complete_task": _complete_task,
+    "bulk_complete_tasks": _bulk_complete_tasks,
+    "delete_task": _delete_task,
+    "bulk_delete_tasks": _bulk_delete_tasks,
+    "update_task": _update_task,
+    "get_weather": _get_weather,
+    "detect_language": _detect_language,
+    "suggest_priority": _suggest_priority,
+    "schedule_reminder": _schedule_reminder,
+    "get_deployment_blueprint": _get_deployment_blueprint,
+    "plan_day": _plan_day,
+}
+
+
+# Main Logic used by both MCP Server and Chat Router
+async def handle_tool_call(name: str, arguments: Any, user_id: str, session: AsyncSession) -> Any:
+    """Execute tool logic with provided session and user context."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Tool not found: {name}")
+    return await handler(arguments, user_id, session)
 
 
 @app_mcp.call_tool()
 async def call_tool(name: str, arguments: Any) -> List[TextContent | ImageContent | EmbeddedResource]:
     """MCP Entry point - Uses local DB session and mock user."""
     # This is for the MCP server interface (if running standalone)
-    with Session(engine) as session:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         # We default to user_123 for MCP local usage
         result = await handle_tool_call(name, arguments, "user_123", session)
         
         # Convert dictionary result to MCP TextContent
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())]
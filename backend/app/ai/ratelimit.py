@@ -0,0 +1,106 @@
+# TodoEvolve Backend - Provider Rate Limiting
+
+"""
+Client-side protection for LLM provider calls.
+
+- TokenBucket: per-model request budget whose refill rate adapts (AIMD)
+  to observed latency and throttling.
+- CircuitBreaker: skips a model for a cooldown period after repeated failures.
+"""
+
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Request token bucket with AIMD rate tuning.
+
+    - Additive increase: +alpha requests/min while latency stays under target
+    - Multiplicative decrease: rate * (1 - beta) on slow responses or 429s
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        alpha: float = 0.5,
+        beta: float = 0.1,
+        latency_target: float = 3.0,
+        min_rate: float = 1.0,
+    ) -> None:
+        self.max_rate = rate_per_minute
+        self.rate = rate_per_minute
+        self.alpha = alpha
+        self.beta = beta
+        self.latency_target = latency_target
+        self.min_rate = min(min_rate, rate_per_minute)
+        # Allow short bursts of up to 10 seconds' worth of requests
+        self.capacity = max(1.0, rate_per_minute / 6)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / 60)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take one token if available. Never blocks."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def on_success(self, latency: float) -> None:
+        """Adjust the rate from a successful call's latency (seconds)."""
+        if latency <= self.latency_target:
+            self.rate = min(self.max_rate, self.rate + self.alpha)
+        else:
+            self._decrease()
+
+    def on_throttle(self) -> None:
+        """The provider pushed back (429 / quota)."""
+        self._decrease()
+
+    def _decrease(self) -> None:
+        self.rate = max(self.min_rate, self.rate * (1 - self.beta))
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures and stays open for `cooldown` seconds."""
+
+    def __init__(self, threshold: int = 3, cooldown: float = 30.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def is_open(self) -> bool:
+        return self.open_until > time.monotonic()
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = time.monotonic() + self.cooldown
+
+    def open_for(self, seconds: float) -> None:
+        """Force the breaker open, e.g. to honour a Retry-After header."""
+        self.open_until = max(self.open_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read a numeric Retry-After header from an HTTP error raised by a provider SDK."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
@@ -8,13 +8,24 @@ For development, supports mock user mode without tokens.
 
 from fastapi import HTTPException, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from typing import Optional
+import jwt
+from cachetools import TTLCache
+from threading import Lock
+from typing import Optional, Tuple
+import time
 
 from .config import get_settings
 
 security = HTTPBearer(auto_error=False)
 
+# JWT signing secret, resolved once
+_SECRET = get_settings().better_auth_secret.encode()
+
+# Verified access tokens: token -> (payload, exp). Entries live at most 60s
+# and are never served past the token's own expiry. Failed decodes are not cached.
+_TOKEN_CACHE: "TTLCache[str, Tuple[dict, float]]" = TTLCache(maxsize=10_000, ttl=60)
+_TOKEN_CACHE_LOCK = Lock()  # sync endpoints call decode_token from worker threads
+
 
 class AuthError(HTTPException):
     """Authentication error."""
@@ -41,17 +52,29 @@ def decode_token(token: str) -> dict:
     Raises:
         AuthError: If token is invalid
     """
-    settings = get_settings()
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(token)
+        if cached is not None:
+            payload, exp = cached
+            if exp > time.time():
+                return payload
+            _TOKEN_CACHE.pop(token, None)
+
     try:
         payload = jwt.decode(
             token,
-            settings.better_auth_secret,
+            _SECRET,
             algorithms=["HS256"]
         )
-        return payload
-    except JWTError as e:
+    except jwt.PyJWTError as e:
         raise AuthError(f"Invalid token: {str(e)}")
 
+    exp = payload.get("exp")
+    if exp is not None:
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[token] = (payload, float(exp))
+    return payload
+
 
 def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Security(security)
@@ -69,8 +92,6 @@ def get_current_user(
     Raises:
         AuthError: If no token or invalid token (production only)
     """
-    settings = get_settings()
-    
     # Removed mock user fallback - always require proper authentication
     # This fixes the bug where tasks were saved with user_123 but fetched with real user_id
     
@@ -15,6 +15,11 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./todoevolve.db"
+    db_pool_size: int = 20  # persistent connections (ignored for SQLite)
+    db_max_overflow: int = 30  # extra connections allowed during bursts
+    db_pool_timeout: float = 5.0  # seconds to wait for a free connection before failing
+    db_pool_pre_ping: bool = True  # validate pooled connections before use
+    db_pool_recycle: int = 3600  # seconds before a pooled connection is replaced
     
     # Authentication
     better_auth_secret: str = "dev-secret-change-in-production-min32chars"
@@ -30,6 +35,29 @@ class Settings(BaseSettings):
     # AI
     gemini_api_key: str = ""
     open_router_key: str = ""
+    llm_max_retries: int = 3  # attempts per provider
+    llm_hedge_delay: float = 2.0  # seconds before firing Gemini alongside a slow OpenRouter call (0 = off)
+    llm_hedge_in_production: bool = False  # hedging can double token spend
+    openrouter_rpm: float = 60.0  # per-model request budget
+    llm_latency_target: float = 3.0  # seconds; slower calls shrink the request budget
+    llm_breaker_threshold: int = 3  # consecutive failures before a model is skipped
+    llm_breaker_cooldown: float = 30.0  # seconds a failing model stays skipped
+    llm_keepalive_expiry: float = 120.0  # seconds an idle provider connection is kept for the next turn
+    openrouter_max_concurrency: int = 10  # in-flight OpenRouter calls; extra callers queue
+    gemini_max_concurrency: int = 8  # in-flight Gemini calls; extra callers queue
+    
+    # AI Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_ttl: int = 3600  # seconds
+    llm_cache_threshold: float = 0.92  # cosine similarity for semantic hits
+    llm_cache_max_entries: int = 5000
+
+    # Worker threads for sync endpoints (anyio's default is 40)
+    threadpool_size: int = 100
+    token_cleanup_interval: int = 3600  # seconds between expired-token purges
+
+    # Redis (optional shared cache; empty = in-process only)
+    redis_url: str = ""
 
     # SMTP
     smtp_host: str = "smtp.gmail.com"
@@ -37,6 +65,7 @@ class Settings(BaseSettings):
     smtp_user: str = ""
     smtp_pass: str = ""
     smtp_from: str = ""
+    smtp_pool_size: int = 4  # idle authenticated connections kept for reuse
     
     @property
     def cors_origins_list(self) -> List[str]:
@@ -55,6 +84,7 @@ class Settings(BaseSettings):
     }
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get settings instance."""
+    """Get the cached settings instance (call get_settings.cache_clear() to reload)."""
     return Settings()
@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import logging
 from typing import Any, Dict, Optional
 
@@ -56,5 +57,11 @@ class AppDaprClient:
             logger.error(f"Failed to publish event to {topic}: {e}")
             return False
 
+    async def publish_event_async(self, topic: str, data: Dict[str, Any]) -> bool:
+        """publish_event for async callers: the blocking sidecar call runs in a worker thread."""
+        if not self.enabled or not self.client:
+            return self.publish_event(topic, data)
+        return await asyncio.to_thread(self.publish_event, topic, data)
+
 # Singleton instance
 dapr_client = AppDaprClient()
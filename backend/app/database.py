@@ -6,8 +6,12 @@ Database connection and session management.
 """
 
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from .config import get_settings
 
@@ -17,19 +21,114 @@ settings = get_settings()
 # Create engine with connection pooling
 # For SQLite (development), we need check_same_thread=False
 connect_args = {}
+engine_kwargs = {}
 if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
+else:
+    # Size the QueuePool for request concurrency; fail fast instead of queueing forever
+    engine_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
 
 engine = create_engine(
     settings.database_url,
     echo=settings.debug,
-    connect_args=connect_args
+    connect_args=connect_args,
+    **engine_kwargs
 )
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Tune each new SQLite connection: WAL lets readers proceed while a writer
+    commits, and NORMAL sync is safe under WAL.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-64000")  # 64 MB
+    cursor.close()
+
+
+if settings.database_url.startswith("sqlite"):
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
+
+
+def _async_database_url(url: str) -> str:
+    """
+    Map a sync database URL to its async driver.
+    sqlite -> aiosqlite, postgresql -> asyncpg (asyncpg takes `ssl`, not libpq's `sslmode`).
+    """
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    if scheme.split("+")[0] not in ("postgres", "postgresql"):
+        return url
+    
+    params = []
+    for key, value in parse_qsl(query):
+        if key == "sslmode":
+            params.append(("ssl", value))
+        elif key != "channel_binding":  # libpq-only option
+            params.append((key, value))
+    return urlunsplit(("postgresql+asyncpg", netloc, path, urlencode(params), fragment))
+
+
+# Async engine for handlers on the event loop (tasks / MCP tools / chat).
+# LIFO reuse keeps hot connections busy and lets idle ones age out.
+async_engine_kwargs = {}
+if not settings.database_url.startswith("sqlite"):
+    async_engine_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_use_lifo": True,
+    }
+
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    echo=settings.debug,
+    **async_engine_kwargs
+)
+
+if settings.database_url.startswith("sqlite"):
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
 def create_db_and_tables() -> None:
-    """Create all database tables."""
+    """Create all database tables, plus any indexes missing from existing tables."""
+    if engine.dialect.name == "postgresql":
+        # Trigram operator classes for the task search indexes
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except Exception as e:
+            print(f"WARNING: could not enable pg_trgm ({e}); task search will not be indexed")
     SQLModel.metadata.create_all(engine)
+    # Superseded by the unique index on refresh_tokens.token_hash; drop it where
+    # an earlier startup created it, so it stops adding write cost
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_refresh_tokens_active"))
+    except Exception as e:
+        print(f"WARNING: could not drop index ix_refresh_tokens_active: {e}")
+    # create_all skips tables that already exist, so newly declared indexes need this
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(engine, checkfirst=True)
+            except Exception as e:
+                print(f"WARNING: could not create index {index.name}: {e}")
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -62,3 +161,17 @@ def get_session_context() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session.
+    
+    Objects stay loaded after commit (expire_on_commit=False) so attribute
+    access never triggers implicit I/O outside an await.
+    
+    Yields:
+        AsyncSession: SQLModel async database session
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
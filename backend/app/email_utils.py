@@ -1,14 +1,12 @@
 import os
+import queue
+import quopri
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.header import Header
+from email.utils import formatdate, make_msgid
 
-def get_email_template(title, message, button_text, button_url):
-    """
-    Generate a minimalist, responsive HTML email template.
-    Uses inline CSS for maximum compatibility.
-    """
-    return f"""
+# Static email markup; get_email_template fills the placeholders
+_EMAIL_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -65,35 +63,166 @@ def get_email_template(title, message, button_text, button_url):
 </html>
     """
 
+_EMAIL_FIELDS = ("title", "title", "message", "button_url", "button_text")
+
+
+def _split_template(template: str, fields) -> tuple:
+    """Split `template` around each {field} placeholder, in order."""
+    parts = []
+    rest = template
+    for field in fields:
+        head, rest = rest.split("{" + field + "}", 1)
+        parts.append(head)
+    parts.append(rest)
+    return tuple(parts)
+
+
+# Literal chunks between the placeholders, computed once at import
+_EMAIL_PARTS = _split_template(_EMAIL_TEMPLATE, _EMAIL_FIELDS)
+
+
+def get_email_template(title, message, button_text, button_url):
+    """
+    Generate a minimalist, responsive HTML email template.
+    Uses inline CSS for maximum compatibility.
+    """
+    p = _EMAIL_PARTS
+    return "".join((p[0], title, p[1], title, p[2], message, p[3], button_url, p[4], button_text, p[5]))
+
 from .config import get_settings
 
 settings = get_settings()
 
+# SMTP configuration, resolved once
+_SMTP_HOST = settings.smtp_host
+_SMTP_PORT = settings.smtp_port
+_SMTP_USER = settings.smtp_user
+_SMTP_PASS = settings.smtp_pass
+_SMTP_FROM = settings.smtp_from or _SMTP_USER
+_MSGID_DOMAIN = _SMTP_FROM.rpartition("@")[2] or "localhost"
+
+# Headers shared by every message; send_email adds Subject/To/Date/Message-ID
+# and the Content-Transfer-Encoding chosen for the body
+_STATIC_HEADERS = (
+    f"From: {_SMTP_FROM}\r\n"
+    "MIME-Version: 1.0\r\n"
+    "Content-Type: text/html; charset=utf-8\r\n"
+).encode()
+
+# RFC 5322 line limit, excluding the CRLF
+_MAX_LINE_OCTETS = 998
+
+
+def _header_value(value: str) -> bytes:
+    """Encode a header value (RFC 2047 only when it isn't plain ASCII)."""
+    if value.isascii():
+        return value.encode()
+    return Header(value, "utf-8").encode().encode()
+
+
+def _encode_body(html_content: str) -> tuple:
+    """
+    Encode the body for the wire. Returns (content_transfer_encoding, body).
+    smtplib only fixes line endings for str messages, so every line break is
+    made CRLF here; a line too long for 8bit switches the body to
+    quoted-printable, which soft-wraps it.
+    """
+    body = html_content.replace("\r\n", "\n").replace("\r", "\n").encode("utf-8")
+    if any(len(line) > _MAX_LINE_OCTETS for line in body.split(b"\n")):
+        return b"quoted-printable", quopri.encodestring(body).replace(b"\n", b"\r\n")
+    return b"8bit", body.replace(b"\n", b"\r\n")
+
+
+def _build_message(to_email: str, subject: str, html_content: str) -> bytes:
+    """Build the single-part text/html message as wire bytes."""
+    encoding, body = _encode_body(html_content)
+    return b"".join((
+        b"Subject: ", _header_value(subject),
+        b"\r\nTo: ", to_email.encode(),
+        b"\r\nDate: ", formatdate(localtime=False, usegmt=True).encode(),
+        b"\r\nMessage-ID: ", make_msgid(domain=_MSGID_DOMAIN).encode(),
+        b"\r\n", _STATIC_HEADERS,
+        b"Content-Transfer-Encoding: ", encoding,
+        b"\r\n\r\n", body,
+    ))
+
+# Authenticated SMTP connections kept open between sends (STARTTLS + AUTH is
+# most of the cost of a single message)
+_smtp_pool: "queue.Queue[smtplib.SMTP]" = queue.Queue(maxsize=settings.smtp_pool_size)
+
+
+def _connect() -> smtplib.SMTP:
+    server = smtplib.SMTP(_SMTP_HOST, _SMTP_PORT)
+    server.starttls()
+    server.login(_SMTP_USER, _SMTP_PASS)
+    return server
+
+
+def _get_conn() -> tuple:
+    """
+    Take a pooled connection, or open a new one. Returns (server, pooled).
+    Pooled connections aren't probed with NOOP; a dead one shows up as a
+    disconnect on send, which send_email retries on a fresh connection.
+    """
+    try:
+        return _smtp_pool.get_nowait(), True
+    except queue.Empty:
+        return _connect(), False
+
+
+def _put_conn(server: smtplib.SMTP) -> None:
+    """Return a connection to the pool (closing it if the pool is full)."""
+    try:
+        _smtp_pool.put_nowait(server)
+    except queue.Full:
+        _quit(server)
+
+
+def _quit(server: smtplib.SMTP) -> None:
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+def close_smtp_pool() -> None:
+    """Close all pooled SMTP connections (called on app shutdown)."""
+    while True:
+        try:
+            _quit(_smtp_pool.get_nowait())
+        except queue.Empty:
+            return
+
+
 def send_email(to_email: str, subject: str, html_content: str) -> bool:
     """
     Send an HTML email using SMTP configuration from settings.
     """
-    smtp_host = settings.smtp_host
-    smtp_port = settings.smtp_port
-    smtp_user = settings.smtp_user
-    smtp_pass = settings.smtp_pass
-    from_email = settings.smtp_from or smtp_user
-    
-    if not smtp_user or not smtp_pass:
+    if not _SMTP_USER or not _SMTP_PASS:
         print(f"SMTP Error: Credentials missing (SMTP_USER/SMTP_PASS). Cannot send email to {to_email}")
         return False
         
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-        msg.attach(MIMEText(html_content, "html"))
+        msg = _build_message(to_email, subject, html_content)
         
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_pass)
-            server.sendmail(from_email, to_email, msg.as_string())
+        server, pooled = _get_conn()
+        try:
+            server.sendmail(_SMTP_FROM, to_email, msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            _quit(server)
+            if not pooled:
+                raise
+            # The server dropped the idle connection; nothing was accepted, so resend once
+            server = _connect()
+            try:
+                server.sendmail(_SMTP_FROM, to_email, msg)
+            except Exception:
+                _quit(server)
+                raise
+        except Exception:
+            _quit(server)  # don't pool a connection in an unknown state
+            raise
+        _put_conn(server)
         
         print(f"Email sent successfully to {to_email}")
         return True
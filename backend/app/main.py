@@ -7,32 +7,62 @@ FastAPI application entry point.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+from anyio import to_thread
 
 from .config import get_settings
 from .database import create_db_and_tables
 from app.routes import health, tasks, chat, auth
+from app.routes.auth import purge_expired_tokens
+from app.ai.mcp_server import close_http_client, get_skills
+from app.ai.engine import close_llm_clients
+from app.redis_client import close_redis
+from app.email_utils import close_smtp_pool
 
 settings = get_settings()
 
 
+async def _token_janitor() -> None:
+    """Periodically revoke/delete expired auth tokens off the request path."""
+    while True:
+        await asyncio.sleep(settings.token_cleanup_interval)
+        try:
+            await asyncio.to_thread(purge_expired_tokens)
+        except Exception as e:
+            print(f"Token cleanup failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     print("TodoEvolve API starting...")
+    # Sync endpoints (auth) run in anyio's threadpool; size it for request concurrency
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
     create_db_and_tables()
     print("Database tables created")
+    token_janitor = asyncio.create_task(_token_janitor())
     
     # Check SMTP configuration
     if not settings.smtp_user:
         print("WARNING: SMTP_USER not set in .env. Email features (Forgot Password, Verify) will simulate sending only.")
     else:
         print(f"SMTP Mode: Enabled (sending as {settings.smtp_user})")
+    
+    # Import the skill registry in the background so the first tool call doesn't pay for it
+    skills_warmup = asyncio.create_task(asyncio.to_thread(get_skills))
         
     yield
     # Shutdown
     print("TodoEvolve API shutting down...")
+    skills_warmup.cancel()
+    token_janitor.cancel()
+    await close_http_client()
+    await close_llm_clients()
+    await close_redis()
+    close_smtp_pool()
 
 
 # Create FastAPI app
@@ -43,6 +73,7 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Mount static files
@@ -6,7 +6,7 @@ Database models using SQLModel.
 """
 
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from typing import Optional, List
 from datetime import datetime
 
@@ -21,6 +21,21 @@ class Task(SQLModel, table=True):
     - Timestamps: created_at, updated_at
     """
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Match the list_tasks query shapes: per-user by date, and per-user status/priority filters
+        Index("ix_tasks_user_created", "user_id", "created_at"),
+        Index("ix_tasks_user_completed_prio", "user_id", "completed", "priority"),
+        # Trigram indexes let PostgreSQL serve the search filter's leading-wildcard ILIKE
+        # (needs pg_trgm, see create_db_and_tables); other databases skip them
+        Index(
+            "ix_tasks_title_trgm", "title",
+            postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_tasks_description_trgm", "description",
+            postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: str = Field(index=True, description="Owner of the task")
@@ -107,7 +122,7 @@ class RefreshToken(SQLModel, table=True):
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True, description="Owner user")
-    token_hash: str = Field(description="SHA256 hash of the refresh token")
+    token_hash: str = Field(unique=True, index=True, max_length=64, description="SHA256 hash of the refresh token")
     
     # Expiration and revocation
     expires_at: datetime = Field(description="Token expiration timestamp")
@@ -153,7 +168,7 @@ class PasswordResetToken(SQLModel, table=True):
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True, description="Owner user")
-    token_hash: str = Field(description="SHA256 hash of the reset token")
+    token_hash: str = Field(index=True, max_length=64, description="SHA256 hash of the reset token")
     
     expires_at: datetime = Field(description="Token expiration timestamp")
     is_used: bool = Field(default=False, description="Whether token has been used")
@@ -173,7 +188,7 @@ class EmailVerificationToken(SQLModel, table=True):
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True, description="Owner user")
-    token_hash: str = Field(description="SHA256 hash of the verification token")
+    token_hash: str = Field(index=True, max_length=64, description="SHA256 hash of the verification token")
     
     expires_at: datetime = Field(description="Token expiration timestamp (24h)")
     
@@ -0,0 +1,45 @@
+# TodoEvolve Backend - Redis Client
+
+"""
+Optional shared Redis connection.
+
+Disabled unless REDIS_URL is set and the `redis` package is installed;
+callers must treat a None client as "no shared cache" and fall back to
+in-process state.
+"""
+
+import logging
+from typing import Optional
+
+from app.config import get_settings
+
+# Check if redis is installed
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+
+def get_redis() -> Optional["aioredis.Redis"]:
+    """Return the shared async Redis client, or None when Redis is not configured."""
+    global _client
+    if _client is None:
+        redis_url = get_settings().redis_url
+        if redis_url and REDIS_AVAILABLE:
+            _client = aioredis.from_url(redis_url, decode_responses=True)
+            logger.info("Redis client initialized")
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
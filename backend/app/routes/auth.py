@@ -12,45 +12,78 @@ Endpoints:
 - GET /auth/me - Get current user profile
 """
 
+import base64
 import hashlib
+import hmac
+import logging
+import random
 import secrets
+import string
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
+from threading import Lock
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from anyio import from_thread
+from cachetools import TTLCache
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
 from fastapi.security import HTTPBearer
 from pydantic import BaseModel, EmailStr, field_validator
-from sqlmodel import Session, select
-from jose import jwt
+from sqlmodel import Session, select, update, delete, or_
+import orjson
 from passlib.context import CryptContext
 
-from ..database import get_session
+from ..auth import get_current_user
+from ..database import get_session, get_session_context
 from ..config import get_settings
 from ..models import User, RefreshToken, PasswordResetToken, EmailVerificationToken
 from ..email_utils import send_email, get_email_template
+from ..redis_client import get_redis
 import secrets
 import os
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # SECURITY CONFIGURATION
 # ============================================================================
 
-# Password hashing (using sha256_crypt for broad compatibility)
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+# Password hashing: bcrypt (native) for new hashes; legacy sha256_crypt hashes
+# still verify and are upgraded on the next successful login
+pwd_context = CryptContext(schemes=["bcrypt", "sha256_crypt"], deprecated="auto", bcrypt__rounds=12)
 
 # JWT Configuration
 ACCESS_TOKEN_EXPIRE_MINUTES = 15
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 JWT_ALGORITHM = "HS256"
 
-# Rate limiting (simple in-memory, use Redis in production)
+# Rate limiting: Redis counters (shared across workers) when configured,
+# otherwise this per-process dict
 login_attempts: dict = {}  # {email: {"count": int, "last_attempt": datetime}}
+_login_attempts_lock = Lock()
+_LOGIN_ATTEMPTS_SWEEP_SIZE = 10000  # prune expired entries once the dict grows past this
 MAX_LOGIN_ATTEMPTS = 5
 LOCKOUT_DURATION_MINUTES = 15
 
+# Character classes for password strength checks
+_UPPER = frozenset(string.ascii_uppercase)
+_LOWER = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+
+# /auth/me responses by user id; dropped whenever the profile changes
+_profile_cache: "TTLCache[str, UserResponse]" = TTLCache(maxsize=10_000, ttl=30)
+_profile_cache_lock = Lock()
+
+# Reset/verification emails sent per (email, client IP) in the last window: repeats
+# get the usual generic answer without touching the DB or SMTP
+EMAIL_THROTTLE_SECONDS = 60
+_email_throttle: "TTLCache[tuple, bool]" = TTLCache(maxsize=10_000, ttl=EMAIL_THROTTLE_SECONDS)
+_email_throttle_lock = Lock()
+
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -67,11 +100,12 @@ class RegisterRequest(BaseModel):
             raise ValueError('Password must be at least 8 characters long')
         if len(v) > 72:
             raise ValueError('Password must be at most 72 characters long')
-        if not any(c.isupper() for c in v):
+        chars = set(v)
+        if not chars & _UPPER:
             raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
+        if not chars & _LOWER:
             raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
+        if not chars & _DIGITS:
             raise ValueError('Password must contain at least one digit')
         return v
 
@@ -121,21 +155,52 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """
+    Hash verified against when the email is unknown, so both login paths cost
+    one bcrypt check. Built on first use rather than at import, so a hashing
+    failure only affects login instead of keeping the app from starting.
+    """
+    return pwd_context.hash(secrets.token_urlsafe(16))
+
+
 def hash_token(token: str) -> str:
-    """Hash refresh token for storage."""
+    """Hash a refresh token for storage (SHA-256 hex)."""
     return hashlib.sha256(token.encode()).hexdigest()
 
 
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS256 signing inputs that never change
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}))
+_JWT_SECRET = settings.better_auth_secret.encode()
+
+
+def token_fingerprint(token: str) -> str:
+    """Keyed hash (HMAC-SHA256 hex) of a reset/verification token for storage."""
+    return hmac.new(_JWT_SECRET, token.encode(), hashlib.sha256).hexdigest()
+
+
 def create_access_token(user_id: int, email: str) -> str:
-    """Create short-lived access token."""
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    """Create short-lived access token (HS256, signed directly with hmac)."""
     payload = {
         "sub": str(user_id),
         "email": email,
         "type": "access",
-        "exp": expire
+        "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     }
-    return jwt.encode(payload, settings.better_auth_secret, algorithm=JWT_ALGORITHM)
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(payload))
+    signature = _b64url(hmac.new(_JWT_SECRET, signing_input, hashlib.sha256).digest())
+    return (signing_input + b"." + signature).decode()
+
+
+def invalidate_profile(user_id) -> None:
+    """Drop the cached /auth/me response for `user_id`."""
+    with _profile_cache_lock:
+        _profile_cache.pop(str(user_id), None)
 
 
 def create_refresh_token() -> str:
@@ -143,40 +208,113 @@ def create_refresh_token() -> str:
     return secrets.token_urlsafe(64)
 
 
+def _login_key(email: str) -> str:
+    return f"login:{email}"
+
+
+# Returned by _redis_run when Redis errors; callers fall back to in-process state
+_REDIS_FAILED = object()
+
+
+def _redis_run(func, *args):
+    """Run a Redis coroutine on the event loop from a threadpool endpoint."""
+    try:
+        return from_thread.run(func, *args)
+    except Exception as e:
+        logger.warning(f"Redis login rate limit failed: {e}")
+        return _REDIS_FAILED
+
+
+def _too_many_attempts(remaining: int) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Too many login attempts. Try again in {remaining} seconds."
+    )
+
+
 def check_rate_limit(email: str) -> None:
     """Check if user is rate limited for login attempts."""
-    if email not in login_attempts:
-        return
-    
-    attempt_data = login_attempts[email]
-    lockout_expires = attempt_data["last_attempt"] + timedelta(minutes=LOCKOUT_DURATION_MINUTES)
-    
-    if datetime.utcnow() > lockout_expires:
-        # Lockout expired, reset counter
-        del login_attempts[email]
-        return
-    
-    if attempt_data["count"] >= MAX_LOGIN_ATTEMPTS:
-        remaining = (lockout_expires - datetime.utcnow()).seconds
-        raise HTTPException(
-            status_code=429,
-            detail=f"Too many login attempts. Try again in {remaining} seconds."
-        )
+    redis = get_redis()
+    if redis is not None:
+        count = _redis_run(redis.get, _login_key(email))
+        if count is not _REDIS_FAILED:
+            if count and int(count) >= MAX_LOGIN_ATTEMPTS:
+                ttl = _redis_run(redis.ttl, _login_key(email))
+                remaining = ttl if isinstance(ttl, int) and ttl > 0 else LOCKOUT_DURATION_MINUTES * 60
+                raise _too_many_attempts(remaining)
+            return
+    
+    with _login_attempts_lock:
+        attempt_data = login_attempts.get(email)
+        if attempt_data is None:
+            return
+        
+        lockout_expires = attempt_data["last_attempt"] + timedelta(minutes=LOCKOUT_DURATION_MINUTES)
+        
+        if datetime.utcnow() > lockout_expires:
+            # Lockout expired, reset counter
+            del login_attempts[email]
+            return
+        
+        if attempt_data["count"] >= MAX_LOGIN_ATTEMPTS:
+            remaining = (lockout_expires - datetime.utcnow()).seconds
+            raise _too_many_attempts(remaining)
 
 
 def record_login_attempt(email: str, success: bool) -> None:
     """Record login attempt for rate limiting."""
-    if success:
-        # Reset on successful login
-        if email in login_attempts:
-            del login_attempts[email]
-        return
-    
-    if email not in login_attempts:
-        login_attempts[email] = {"count": 0, "last_attempt": datetime.utcnow()}
+    redis = get_redis()
+    if redis is not None:
+        key = _login_key(email)
+        if success:
+            # Reset on successful login
+            if _redis_run(redis.delete, key) is not _REDIS_FAILED:
+                return
+        else:
+            count = _redis_run(redis.incr, key)
+            if count is not _REDIS_FAILED:
+                if count == 1:
+                    _redis_run(redis.expire, key, LOCKOUT_DURATION_MINUTES * 60)
+                return
+    
+    with _login_attempts_lock:
+        if success:
+            # Reset on successful login
+            login_attempts.pop(email, None)
+            return
+        
+        now = datetime.utcnow()
+        if len(login_attempts) >= _LOGIN_ATTEMPTS_SWEEP_SIZE:
+            cutoff = now - timedelta(minutes=LOCKOUT_DURATION_MINUTES)
+            for stale in [e for e, data in login_attempts.items() if data["last_attempt"] < cutoff]:
+                del login_attempts[stale]
+        
+        attempt_data = login_attempts.setdefault(email, {"count": 0, "last_attempt": now})
+        attempt_data["count"] += 1
+        attempt_data["last_attempt"] = now
+
+
+def purge_expired_tokens() -> None:
+    """
+    Bulk housekeeping for token tables (run periodically from main.py).
     
-    login_attempts[email]["count"] += 1
-    login_attempts[email]["last_attempt"] = datetime.utcnow()
+    - Revokes expired refresh tokens; deletes them 30 days after expiry
+    - Deletes used or expired password reset and email verification tokens
+    """
+    now = datetime.utcnow()
+    with get_session_context() as session:
+        session.exec(
+            update(RefreshToken)
+            .where(RefreshToken.expires_at < now, RefreshToken.is_revoked == False)
+            .values(is_revoked=True)
+        )
+        session.exec(delete(RefreshToken).where(RefreshToken.expires_at < now - timedelta(days=30)))
+        session.exec(
+            delete(PasswordResetToken).where(
+                or_(PasswordResetToken.is_used == True, PasswordResetToken.expires_at < now)
+            )
+        )
+        session.exec(delete(EmailVerificationToken).where(EmailVerificationToken.expires_at < now))
 
 
 # ============================================================================
@@ -184,8 +322,9 @@ def record_login_attempt(email: str, success: bool) -> None:
 # ============================================================================
 
 @router.post("/register", response_model=UserResponse, status_code=201)
-async def register(
+def register(
     request: RegisterRequest,
+    background: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
@@ -197,7 +336,7 @@ async def register(
     """
     # Check if email already exists
     existing = session.exec(
-        select(User).where(User.email == request.email.lower())
+        select(User.id).where(User.email == request.email.lower()).limit(1)
     ).first()
     
     if existing:
@@ -221,7 +360,7 @@ async def register(
     # ---------------------------------------------------------
     try:
         verify_token = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(verify_token.encode()).hexdigest()
+        token_hash = token_fingerprint(verify_token)
         
         db_token = EmailVerificationToken(
             user_id=user.id,
@@ -241,7 +380,8 @@ async def register(
             button_url=verify_url
         )
         
-        send_email(user.email, "Verify your TodoEvolve Account", html_content)
+        # Sent after the response so SMTP latency isn't on the request path
+        background.add_task(send_email, user.email, "Verify your TodoEvolve Account", html_content)
         
     except Exception as e:
         print(f"Failed to send verification email: {e}")
@@ -258,7 +398,7 @@ async def register(
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(
+def login(
     request: LoginRequest,
     req: Request,
     session: Session = Depends(get_session)
@@ -274,13 +414,16 @@ async def login(
     # Check rate limit
     check_rate_limit(email)
     
-    # Find user
+    # Find user (only the columns login needs)
     user = session.exec(
-        select(User).where(User.email == email)
+        select(User.id, User.email, User.hashed_password, User.is_active, User.is_verified)
+        .where(User.email == email)
+        .limit(1)
     ).first()
     
     # Verify credentials (constant time to prevent timing attacks)
-    if not user or not verify_password(request.password, user.hashed_password):
+    password_ok = verify_password(request.password, user.hashed_password if user else _dummy_password_hash())
+    if not user or not password_ok:
         record_login_attempt(email, success=False)
         raise HTTPException(
             status_code=401,
@@ -304,9 +447,12 @@ async def login(
     # Record successful login
     record_login_attempt(email, success=True)
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    session.add(user)
+    # Update last login, upgrading legacy hashes now that we have the plaintext
+    user_values = {"last_login": datetime.utcnow()}
+    if pwd_context.needs_update(user.hashed_password):
+        user_values["hashed_password"] = hash_password(request.password)
+    session.exec(update(User).where(User.id == user.id).values(**user_values))
+    invalidate_profile(user.id)
     
     # Create tokens
     access_token = create_access_token(user.id, user.email)
@@ -320,7 +466,7 @@ async def login(
         user_agent=req.headers.get("User-Agent", "")[:500]
     )
     session.add(token_record)
-    session.commit()
+    session.commit()  # UPDATE + INSERT in one transaction
     
     return TokenResponse(
         access_token=access_token,
@@ -329,7 +475,7 @@ async def login(
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(
+def refresh_token(
     request: RefreshRequest,
     req: Request,
     session: Session = Depends(get_session)
@@ -343,38 +489,26 @@ async def refresh_token(
     """
     token_hash = hash_token(request.refresh_token)
     
-    # Find valid refresh token
-    stored_token = session.exec(
-        select(RefreshToken).where(
+    # Find a valid (unrevoked, unexpired) token and its active user in one query;
+    # expired rows are revoked in bulk by purge_expired_tokens
+    row = session.exec(
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(
             RefreshToken.token_hash == token_hash,
-            RefreshToken.is_revoked == False
+            RefreshToken.is_revoked == False,
+            RefreshToken.expires_at > datetime.utcnow(),
+            User.is_active == True
         )
+        .limit(1)
     ).first()
     
-    if not stored_token:
+    if not row:
         raise HTTPException(
             status_code=401,
-            detail="Invalid refresh token"
-        )
-    
-    # Check expiration
-    if datetime.utcnow() > stored_token.expires_at:
-        # Revoke expired token
-        stored_token.is_revoked = True
-        session.add(stored_token)
-        session.commit()
-        raise HTTPException(
-            status_code=401,
-            detail="Refresh token has expired. Please login again."
-        )
-    
-    # Get user
-    user = session.get(User, stored_token.user_id)
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=401,
-            detail="User account not found or disabled"
+            detail="Invalid or expired refresh token. Please login again."
         )
+    stored_token, user = row
     
     # Rotate refresh token (revoke old, create new)
     stored_token.is_revoked = True
@@ -400,7 +534,7 @@ async def refresh_token(
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(
+def logout(
     request: RefreshRequest,
     session: Session = Depends(get_session)
 ):
@@ -413,49 +547,40 @@ async def logout(
     token_hash = hash_token(request.refresh_token)
     
     stored_token = session.exec(
-        select(RefreshToken).where(RefreshToken.token_hash == token_hash)
+        select(RefreshToken).where(RefreshToken.token_hash == token_hash).limit(1)
     ).first()
     
     if stored_token and not stored_token.is_revoked:
         stored_token.is_revoked = True
         session.add(stored_token)
         session.commit()
+        invalidate_profile(stored_token.user_id)
     
     return MessageResponse(message="Successfully logged out")
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(
-    req: Request,
+def get_current_user_profile(
+    user_id: str = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """
     Get current authenticated user's profile.
     
     - Requires valid access token in Authorization header
+    - Served from a short-lived (30s) per-user cache
     """
-    from ..auth import get_current_user
-    
-    # Extract token from Authorization header
-    auth_header = req.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
-    
-    token = auth_header[7:]  # Remove "Bearer " prefix
-    
-    try:
-        payload = jwt.decode(token, settings.better_auth_secret, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
+    user_id = str(user_id)
+    with _profile_cache_lock:
+        profile = _profile_cache.get(user_id)
+    if profile is not None:
+        return profile
     
     user = session.get(User, int(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return UserResponse(
+    profile = UserResponse(
         id=user.id,
         email=user.email,
         is_active=user.is_active,
@@ -464,6 +589,9 @@ async def get_current_user_profile(
         last_login=user.last_login,
         profile_picture=user.profile_picture
     )
+    with _profile_cache_lock:
+        _profile_cache[user_id] = profile
+    return profile
 
 
 # ============================================================================
@@ -483,18 +611,39 @@ class ResetPasswordRequest(BaseModel):
     def validate_password(cls, v: str) -> str:
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
+        chars = set(v)
+        if not chars & _UPPER:
             raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
+        if not chars & _LOWER:
             raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
+        if not chars & _DIGITS:
             raise ValueError('Password must contain at least one digit')
         return v
 
 
+def _mask_timing() -> None:
+    """
+    Stand-in for the token insert/commit on paths that skip it, so response time
+    doesn't reveal whether an account exists (emails are sent after the response).
+    """
+    time.sleep(random.uniform(0.005, 0.02))
+
+
+def email_throttled(email: str, req: Request) -> bool:
+    """True if this email/client pair already triggered an email within the window (else records it)."""
+    key = (email.lower(), req.client.host if req.client else None)
+    with _email_throttle_lock:
+        if key in _email_throttle:
+            return True
+        _email_throttle[key] = True
+    return False
+
+
 @router.post("/forgot-password", response_model=MessageResponse)
-async def forgot_password(
+def forgot_password(
     request: ForgotPasswordRequest,
+    req: Request,
+    background: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
     """
@@ -503,24 +652,23 @@ async def forgot_password(
     - Sends email with reset token (SMTP)
     - Token valid for 1 hour
     - Stores token in database
+    - At most one email per address and client every EMAIL_THROTTLE_SECONDS
     """
-    import smtplib
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-    import os
+    if email_throttled(request.email, req):
+        return MessageResponse(message="If the email exists, a reset link has been sent.")
     
     # Find user by email
-    statement = select(User).where(User.email == request.email.lower())
+    statement = select(User).where(User.email == request.email.lower()).limit(1)
     user = session.exec(statement).first()
     
     # Always return success (security: don't reveal if email exists)
     if not user:
-        # Simulate processing time to prevent timing attacks
+        _mask_timing()
         return MessageResponse(message="If the email exists, a reset link has been sent.")
     
     # Generate reset token
     reset_token = secrets.token_urlsafe(32)
-    token_hash = hashlib.sha256(reset_token.encode()).hexdigest()
+    token_hash = token_fingerprint(reset_token)
     
     # Create DB record
     db_token = PasswordResetToken(
@@ -531,8 +679,6 @@ async def forgot_password(
     session.add(db_token)
     session.commit()
     
-    # SMTP Configuration (Handled by email_utils)
-    
     # Create reset URL
     frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3005")
     reset_url = f"{frontend_url}/reset-password?token={reset_token}"
@@ -545,14 +691,14 @@ async def forgot_password(
         button_url=reset_url
     )
     
-    # Send Email
-    send_email(request.email, "Reset Your Password", html_content)
+    # Send Email (after the response)
+    background.add_task(send_email, request.email, "Reset Your Password", html_content)
     
     return MessageResponse(message="If the email exists, a reset link has been sent.")
 
 
 @router.post("/reset-password", response_model=MessageResponse)
-async def reset_password(
+def reset_password(
     request: ResetPasswordRequest,
     session: Session = Depends(get_session)
 ):
@@ -565,21 +711,18 @@ async def reset_password(
     - Invalidates token (marks as used)
     - Revokes all sessions
     """
-    token_hash = hashlib.sha256(request.token.encode()).hexdigest()
+    token_hash = token_fingerprint(request.token)
     
-    # Find valid token in DB
+    # Find valid (unused, unexpired) token in DB
     statement = select(PasswordResetToken).where(
         PasswordResetToken.token_hash == token_hash,
-        PasswordResetToken.is_used == False
-    )
+        PasswordResetToken.is_used == False,
+        PasswordResetToken.expires_at > datetime.utcnow()
+    ).limit(1)
     db_token = session.exec(statement).first()
     
     if not db_token:
-        raise HTTPException(status_code=400, detail="Invalid or used reset token")
-    
-    # Check expiry
-    if datetime.utcnow() > db_token.expires_at:
-        raise HTTPException(status_code=400, detail="Reset token has expired")
+        raise HTTPException(status_code=400, detail="Invalid, used or expired reset token")
     
     # Get user
     user = session.get(User, db_token.user_id)
@@ -595,11 +738,8 @@ async def reset_password(
     session.add(db_token)
     
     # Revoke all refresh tokens for this user (security: force re-login)
-    statement = select(RefreshToken).where(RefreshToken.user_id == user.id)
-    existing_tokens = session.exec(statement).all()
-    for token in existing_tokens:
-        session.delete(token)
-        
+    session.exec(delete(RefreshToken).where(RefreshToken.user_id == user.id))
+    
     session.commit()
     
     return MessageResponse(message="Password reset successfully. Please login with your new password.")
@@ -623,24 +763,12 @@ class ChangePasswordRequest(BaseModel):
 
 
 @router.post("/change-password", response_model=MessageResponse)
-async def change_password(
+def change_password(
     request: ChangePasswordRequest,
-    req: Request,
+    user_id: str = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """Change current user's password."""
-    # Get current user (duplicate logic to avoid circular import)
-    from jose import jwt
-    auth_header = req.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    token = auth_header[7:]
-    try:
-        payload = jwt.decode(token, settings.better_auth_secret, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-    except:
-        raise HTTPException(status_code=401, detail="Invalid token")
-        
     user = session.get(User, int(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -658,49 +786,55 @@ async def change_password(
 
 
 from fastapi import UploadFile, File
-import shutil
 import os
-import uuid
+import tempfile
+
+# Avatars are stored by content hash, so identical uploads share one file
+UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "static", "uploads", "avatars")
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+MAX_AVATAR_BYTES = 5 * 1024 * 1024
+_AVATAR_CHUNK = 1 << 20
+_AVATAR_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+)
 
 @router.post("/upload-avatar", response_model=UserResponse)
-async def upload_avatar(
+def upload_avatar(
+    req: Request,
     file: UploadFile = File(...),
-    req: Request = None,  # Optional to avoid validation error if not passed, but we need it
+    user_id: str = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
     """Upload user profile picture."""
-    # Build complete auth check
-    if not req:
-        raise HTTPException(status_code=400, detail="Request context missing")
-        
-    from jose import jwt
-    auth_header = req.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    
-    try:
-        token = auth_header[7:]
-        payload = jwt.decode(token, settings.better_auth_secret, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("sub")
-    except:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
     user = session.get(User, int(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Save file
-    UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "static", "uploads", "avatars")
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-        
-    # Generate unique filename
-    ext = os.path.splitext(file.filename)[1]
-    filename = f"{user.id}_{uuid.uuid4()}{ext}"
+    # Read in 1 MB chunks, hashing as we go; type comes from the magic bytes
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while chunk := file.file.read(_AVATAR_CHUNK):
+        size += len(chunk)
+        if size > MAX_AVATAR_BYTES:
+            raise HTTPException(status_code=413, detail="Avatar must be 5 MB or smaller")
+        digest.update(chunk)
+        chunks.append(chunk)
+    
+    head = chunks[0][:8] if chunks else b""
+    ext = next((ext for magic, ext in _AVATAR_SIGNATURES if head.startswith(magic)), None)
+    if ext is None:
+        raise HTTPException(status_code=400, detail="Avatar must be a PNG or JPEG image")
+    
+    filename = f"{digest.hexdigest()}{ext}"
     file_path = os.path.join(UPLOAD_DIR, filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    if not os.path.exists(file_path):
+        # Write to a temp file and rename so a concurrent reader never sees a partial image
+        fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR)
+        with os.fdopen(fd, "wb") as buffer:
+            buffer.writelines(chunks)
+        os.replace(tmp_path, file_path)
         
     # Update user profile
     # Get base URL from request or env
@@ -711,6 +845,7 @@ async def upload_avatar(
     user.profile_picture = profile_url
     session.add(user)
     session.commit()
+    invalidate_profile(user.id)
     session.refresh(user)
     
     return UserResponse(
@@ -730,26 +865,24 @@ class VerifyEmailRequest(BaseModel):
 
 
 @router.post("/verify-email", response_model=MessageResponse)
-async def verify_email(
+def verify_email(
     request: VerifyEmailRequest,
     session: Session = Depends(get_session)
 ):
     """
     Verify email address using token.
     """
-    token_hash = hashlib.sha256(request.token.encode()).hexdigest()
+    token_hash = token_fingerprint(request.token)
     
-    # Find token
-    statement = select(EmailVerificationToken).where(EmailVerificationToken.token_hash == token_hash)
+    # Find unexpired token (expired ones are removed by purge_expired_tokens)
+    statement = select(EmailVerificationToken).where(
+        EmailVerificationToken.token_hash == token_hash,
+        EmailVerificationToken.expires_at > datetime.utcnow()
+    ).limit(1)
     db_token = session.exec(statement).first()
     
     if not db_token:
-        raise HTTPException(status_code=400, detail="Invalid verification token")
-        
-    if datetime.utcnow() > db_token.expires_at:
-        session.delete(db_token)
-        session.commit()
-        raise HTTPException(status_code=400, detail="Verification token has expired")
+        raise HTTPException(status_code=400, detail="Invalid or expired verification token")
         
     # Get user
     user = session.get(User, db_token.user_id)
@@ -764,6 +897,7 @@ async def verify_email(
     # Delete token
     session.delete(db_token)
     session.commit()
+    invalidate_profile(user.id)
     
     return MessageResponse(message="Email verified successfully")
 
@@ -774,23 +908,26 @@ class ResendVerificationRequest(BaseModel):
 
 
 @router.post("/resend-verification", response_model=MessageResponse)
-async def resend_verification(
+def resend_verification(
     request: ResendVerificationRequest,
+    req: Request,
+    background: BackgroundTasks,
     session: Session = Depends(get_session)
 ):
-    """Resend verification email (public)."""
-    user = session.exec(select(User).where(User.email == request.email.lower())).first()
+    """Resend verification email (public, throttled like forgot-password)."""
+    if email_throttled(request.email, req):
+        return MessageResponse(message="If the account exists, a verification email has been sent.")
     
-    if not user:
-        # Security: don't reveal user existence
+    user = session.exec(select(User).where(User.email == request.email.lower()).limit(1)).first()
+    
+    # Security: the same answer whether the account is unknown, verified or pending
+    if not user or user.is_verified:
+        _mask_timing()
         return MessageResponse(message="If the account exists, a verification email has been sent.")
-        
-    if user.is_verified:
-         return MessageResponse(message="Email is already verified.")
 
     # Generate new token
     verify_token = secrets.token_urlsafe(32)
-    token_hash = hashlib.sha256(verify_token.encode()).hexdigest()
+    token_hash = token_fingerprint(verify_token)
     
     # Invalidate/delete old tokens (optional but good)
     # session.exec(delete(EmailVerificationToken).where(...))
@@ -813,6 +950,6 @@ async def resend_verification(
         button_url=verify_url
     )
     
-    send_email(user.email, "Verify your TodoEvolve Account", html_content)
+    background.add_task(send_email, user.email, "Verify your TodoEvolve Account", html_content)
     
-    return MessageResponse(message=f"Verification email sent to {user.email}")
+    return MessageResponse(message="If the account exists, a verification email has been sent.")
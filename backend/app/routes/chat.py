@@ -6,22 +6,25 @@ AI Chat endpoint with intelligent fallback between OpenRouter and Gemini.
 Handles rate limits gracefully by switching providers.
 """
 
-import json
 import logging
 import traceback
 import asyncio
 from typing import Optional, Tuple, Any
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, delete
+from fastapi.responses import StreamingResponse
+from sqlmodel import select, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 
-from ..database import get_session
+from ..database import get_async_session, async_engine
 from ..auth import get_current_user
 from ..config import get_settings
 from ..models import ChatMessage
 from ..schemas import ChatMessageResponse
-from ..ai.mcp_server import list_tools, handle_tool_call, get_tool_definitions
-from ..ai.engine import dual_provider_chat, extract_json
+from ..ai.mcp_server import handle_tool_call, TOOL_DEFINITIONS
+from ..ai.cache import TOOL_OUTPUT_PREFIX
+from ..ai.engine import dual_provider_chat, dual_provider_stream, extract_tool_call, warm_provider
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 settings = get_settings()
@@ -59,6 +62,11 @@ User ID: {user_id}
 Language: {language}
 """
 
+# Everything before the per-user context is the same for every request: render it
+# once, which also keeps it a stable prefix for provider-side prompt caching
+_PROMPT_HEAD, _PROMPT_CONTEXT = SYSTEM_PROMPT_TEMPLATE.split("Current Context:\n")
+SYSTEM_PROMPT_PREFIX = _PROMPT_HEAD.format(tool_definitions=TOOL_DEFINITIONS) + "Current Context:\n"
+
 
 # ============================================================================
 # REQUEST MODEL
@@ -69,6 +77,27 @@ class ChatRequest(BaseModel):
     language: str = "en"
 
 
+MAX_TURNS = 10 # Increased from 5 to allow complex multi-step actions (List -> Bulk Delete)
+TURN_LIMIT_RESPONSE = "Done! I've completed all the requested actions. Let me know if you need anything else!"
+
+
+def _build_messages(request: ChatRequest, user_id: str) -> list:
+    """System prompt (pre-rendered prefix + per-user context) + the user's message."""
+    system_instruction = SYSTEM_PROMPT_PREFIX + _PROMPT_CONTEXT.format(
+        user_id=user_id,
+        language=request.language
+    )
+    return [
+        {"role": "system", "content": system_instruction},
+        {"role": "user", "content": request.message}
+    ]
+
+
+def _tool_output_message(tool_result: Any) -> dict:
+    payload = orjson.dumps(tool_result, default=str, option=orjson.OPT_NAIVE_UTC).decode()
+    return {"role": "user", "content": f"{TOOL_OUTPUT_PREFIX} {payload}"}
+
+
 # ============================================================================
 # CHAT ENDPOINT
 # ============================================================================
@@ -76,22 +105,22 @@ class ChatRequest(BaseModel):
 @router.get("/history", response_model=list[ChatMessageResponse])
 async def get_chat_history(
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get chat history for the current user."""
     query = select(ChatMessage).where(ChatMessage.user_id == current_user).order_by(ChatMessage.created_at)
-    return session.exec(query).all()
+    return (await session.exec(query)).all()
 
 
 @router.delete("/history")
 async def clear_chat_history(
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Clear chat history for the current user."""
     statement = delete(ChatMessage).where(ChatMessage.user_id == current_user)
-    session.exec(statement)
-    session.commit()
+    await session.exec(statement)
+    await session.commit()
     return {"message": "Chat history cleared"}
 
 
@@ -99,35 +128,19 @@ async def clear_chat_history(
 async def chat_endpoint(
     request: ChatRequest,
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Chat with the AI using dual provider fallback.
     Tries OpenRouter first, falls back to Gemini on rate limit.
     """
-    # 0. Save User Message
-    user_msg = ChatMessage(user_id=current_user, role="user", content=request.message)
-    session.add(user_msg)
-    session.commit()
+    # 0. User Message - created now (so it sorts before the reply), saved with it in one commit
+    chat_log = [ChatMessage(user_id=current_user, role="user", content=request.message)]
 
     try:
-        # 1. Prepare Tools
-        tools = await list_tools()
-        tool_defs = get_tool_definitions(tools)
-        
-        # 2. Prepare System Prompt
-        system_instruction = SYSTEM_PROMPT_TEMPLATE.format(
-            tool_definitions=tool_defs,
-            user_id=current_user,
-            language=request.language
-        )
+        # 1. Prepare System Prompt
+        messages = _build_messages(request, current_user)
         
-        messages = [
-            {"role": "system", "content": system_instruction},
-            {"role": "user", "content": request.message}
-        ]
-        
-        MAX_TURNS = 10 # Increased from 5 to allow complex multi-step actions (List -> Bulk Delete)
         turn_count = 0
         action_performed = False
         last_tool_name = None
@@ -137,19 +150,17 @@ async def chat_endpoint(
             turn_count += 1
             logger.info(f"Turn {turn_count}: Sending request to AI...")
             
-            # 3. Call AI with Dual Provider Fallback
+            # 2. Call AI with Dual Provider Fallback
             ai_message, used_model = await dual_provider_chat(messages)
             logger.info(f"AI Response ({used_model}): {ai_message[:100]}...")
 
-            # 4. Check for Tool Call (JSON)
-            tool_call_data = extract_json(ai_message)
+            # 3. Check for Tool Call (JSON)
+            tool_call_data = extract_tool_call(ai_message)
             
-            if not tool_call_data:
+            if tool_call_data is None:
                 # No tool call = Final Text Response
-                # Save Assistant Response
-                ai_msg = ChatMessage(user_id=current_user, role="assistant", content=ai_message)
-                session.add(ai_msg)
-                session.commit()
+                # Save Assistant Response (committed with the user message below)
+                chat_log.append(ChatMessage(user_id=current_user, role="assistant", content=ai_message))
                 
                 return {
                     "response": ai_message,
@@ -164,19 +175,23 @@ async def chat_endpoint(
             
             logger.info(f"Executing Tool: {tool_name}")
             
-            # Execute Tool (Uses shared session and user_id)
-            tool_result = await handle_tool_call(tool_name, tool_args, current_user, session)
+            # Execute Tool (Uses shared session and user_id) while the provider
+            # connection for the next turn is warmed up
+            tool_result, _ = await asyncio.gather(
+                handle_tool_call(tool_name, tool_args, current_user, session),
+                warm_provider()
+            )
             action_performed = True
             last_tool_name = tool_name
             
             # Append Interaction to History
             messages.append({"role": "assistant", "content": ai_message})
-            messages.append({"role": "user", "content": f"Tool Output: {json.dumps(tool_result, default=str)}"})
+            messages.append(_tool_output_message(tool_result))
             
             # Loop continues...
         
         return {
-            "response": "Done! I've completed all the requested actions. Let me know if you need anything else!",
+            "response": TURN_LIMIT_RESPONSE,
             "action_performed": True,
             "tool": last_tool_name,
             "model": used_model
@@ -187,4 +202,96 @@ async def chat_endpoint(
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         logger.error(traceback.format_exc())
+        await session.rollback()
         return {"response": "Sorry, I encountered an error. Please try again."}
+    finally:
+        # One commit for the whole exchange (the user message is kept even on errors)
+        session.add_all(chat_log)
+        await session.commit()
+
+
+def _sse(event: dict) -> str:
+    return f"data: {orjson.dumps(event).decode()}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Same tool loop as POST /chat, but the answer is streamed as Server-Sent Events:
+    - {"delta": "..."} for each piece of assistant text
+    - {"done": true, "action_performed", "tool", "model"} once finished
+    - {"error": "..."} if the request fails
+    Turns that look like a tool call (start with JSON or a code fence) are
+    buffered instead of streamed, so raw tool JSON never reaches the client.
+    """
+    async def event_stream():
+        # The stream outlives the request scope, so it owns its session
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            session.add(ChatMessage(user_id=current_user, role="user", content=request.message))
+            await session.commit()
+            
+            messages = _build_messages(request, current_user)
+            action_performed = False
+            last_tool_name = None
+            used_model = None
+            
+            try:
+                for turn_count in range(1, MAX_TURNS + 1):
+                    logger.info(f"Turn {turn_count}: Streaming request to AI...")
+                    parts = []
+                    forwarding = None  # undecided until the first non-blank text
+                    
+                    async for delta, used_model in dual_provider_stream(messages):
+                        parts.append(delta)
+                        if forwarding is None:
+                            head = "".join(parts).lstrip()
+                            if not head:
+                                continue
+                            forwarding = head[0] not in "{[`"
+                            if forwarding:
+                                yield _sse({"delta": "".join(parts)})
+                        elif forwarding:
+                            yield _sse({"delta": delta})
+                    
+                    ai_message = "".join(parts)
+                    tool_call_data = extract_tool_call(ai_message)
+                    
+                    if tool_call_data is None:
+                        if not forwarding:
+                            yield _sse({"delta": ai_message})
+                        session.add(ChatMessage(user_id=current_user, role="assistant", content=ai_message))
+                        await session.commit()
+                        yield _sse({
+                            "done": True,
+                            "action_performed": action_performed,
+                            "tool": last_tool_name,
+                            "model": used_model
+                        })
+                        return
+                    
+                    tool_name = tool_call_data.get("tool")
+                    logger.info(f"Executing Tool: {tool_name}")
+                    tool_result, _ = await asyncio.gather(
+                        handle_tool_call(tool_name, tool_call_data.get("arguments", {}), current_user, session),
+                        warm_provider()
+                    )
+                    action_performed = True
+                    last_tool_name = tool_name
+                    
+                    messages.append({"role": "assistant", "content": ai_message})
+                    messages.append(_tool_output_message(tool_result))
+                    if forwarding:
+                        # Prose before the tool call was already sent; separate the next turn
+                        yield _sse({"delta": "\n\n"})
+                
+                yield _sse({"delta": TURN_LIMIT_RESPONSE})
+                yield _sse({"done": True, "action_performed": True, "tool": last_tool_name, "model": used_model})
+            except Exception as e:
+                logger.error(f"Error in chat stream: {e}")
+                logger.error(traceback.format_exc())
+                yield _sse({"error": "Sorry, I encountered an error. Please try again."})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
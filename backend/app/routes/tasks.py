@@ -6,11 +6,14 @@ Task CRUD API endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from pydantic import TypeAdapter
+from sqlalchemy import case
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional, List
 from datetime import datetime
 
-from ..database import get_session
+from ..database import get_async_session
 from ..models import Task
 from ..schemas import (
     TaskCreate, 
@@ -21,18 +24,23 @@ from ..schemas import (
 )
 from ..auth import get_current_user, verify_user_access
 from ..dapr_client import dapr_client
-from ..dapr_client import dapr_client
 
 router = APIRouter(prefix="/api/{user_id}/tasks", tags=["tasks"])
 
+# Semantic priority order for sort=priority (high first)
+_PRIORITY_ORDER = case({"high": 0, "medium": 1, "low": 2}, value=Task.priority, else_=3)
+
+# Built once: validates a whole page of ORM rows in a single call
+_TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponse])
+
 
-def get_task_or_404(
-    session: Session, 
+async def get_task_or_404(
+    session: AsyncSession, 
     task_id: int, 
     user_id: str
 ) -> Task:
     """Get task by ID or raise 404."""
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task or task.user_id != user_id:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -45,14 +53,18 @@ async def list_tasks(
     priority: Optional[str] = Query(None, pattern="^(high|medium|low)$"),
     sort: str = Query("created_desc", pattern="^(created_asc|created_desc|priority|title)$"),
     search: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> TaskListResponse:
     """
     List all tasks for authenticated user.
     
     Supports filtering by status, priority, and search.
     Supports sorting by created date, priority, or title.
+    Optionally paginated with limit/offset (no limit returns every match);
+    `total` counts all matching tasks.
     """
     verify_user_access(current_user, user_id)
     
@@ -78,6 +90,10 @@ async def list_tasks(
                 Task.description.ilike(search_pattern)
             )
         
+        total = (await session.exec(
+            select(func.count()).select_from(statement.subquery())
+        )).one()
+        
         # Apply sorting
         if sort == "created_asc":
             statement = statement.order_by(Task.created_at.asc())
@@ -85,15 +101,19 @@ async def list_tasks(
             statement = statement.order_by(Task.created_at.desc())
         elif sort == "priority":
             # Custom order: high > medium > low
-            statement = statement.order_by(Task.priority.desc())
+            statement = statement.order_by(_PRIORITY_ORDER, Task.created_at.desc())
         elif sort == "title":
             statement = statement.order_by(Task.title.asc())
         
-        tasks = session.exec(statement).all()
+        if limit is not None:
+            statement = statement.limit(limit)
+        if offset:
+            statement = statement.offset(offset)
+        tasks = (await session.exec(statement)).all()
         
         return TaskListResponse(
-            tasks=[TaskResponse.model_validate(t) for t in tasks],
-            total=len(tasks)
+            tasks=_TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True),
+            total=total
         )
     except Exception as e:
         logger.error(f"Error in list_tasks: {e}", exc_info=True)
@@ -106,7 +126,7 @@ async def create_task(
     user_id: str,
     task_data: TaskCreate,
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> TaskResponse:
     """Create a new task."""
     verify_user_access(current_user, user_id)
@@ -120,11 +140,11 @@ async def create_task(
     )
     
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await session.commit()
+    await session.refresh(task)
     
     # Publish event
-    dapr_client.publish_event("task.created", task.model_dump(mode='json'))
+    await dapr_client.publish_event_async("task.created", task.model_dump(mode='json'))
     
     return TaskResponse.model_validate(task)
 
@@ -134,11 +154,11 @@ async def get_task(
     user_id: str,
     task_id: int,
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> TaskResponse:
     """Get a single task by ID."""
     verify_user_access(current_user, user_id)
-    task = get_task_or_404(session, task_id, user_id)
+    task = await get_task_or_404(session, task_id, user_id)
     return TaskResponse.model_validate(task)
 
 
@@ -148,11 +168,11 @@ async def update_task(
     task_id: int,
     task_data: TaskUpdate,
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> TaskResponse:
     """Update an existing task."""
     verify_user_access(current_user, user_id)
-    task = get_task_or_404(session, task_id, user_id)
+    task = await get_task_or_404(session, task_id, user_id)
     
     # Update only provided fields
     update_data = task_data.model_dump(exclude_unset=True)
@@ -161,11 +181,11 @@ async def update_task(
     
     task.mark_updated()
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    await session.commit()
+    await session.refresh(task)
     
     # Publish event
-    dapr_client.publish_event("task.updated", task.model_dump(mode='json'))
+    await dapr_client.publish_event_async("task.updated", task.model_dump(mode='json'))
     
     return TaskResponse.model_validate(task)
 
@@ -175,20 +195,17 @@ async def delete_task(
     user_id: str,
     task_id: int,
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> None:
     """Delete a task."""
     verify_user_access(current_user, user_id)
-    task = get_task_or_404(session, task_id, user_id)
-    
-    session.delete(task)
-    session.commit()
+    task = await get_task_or_404(session, task_id, user_id)
     
-    # Publish event
-    dapr_client.publish_event("task.deleted", {"id": task_id, "user_id": user_id})
+    await session.delete(task)
+    await session.commit()
     
     # Publish event
-    dapr_client.publish_event("task.deleted", {"id": task_id, "user_id": user_id})
+    await dapr_client.publish_event_async("task.deleted", {"id": task_id, "user_id": user_id})
 
 
 @router.patch("/{task_id}/complete", response_model=TaskToggleResponse)
@@ -196,19 +213,19 @@ async def toggle_complete(
     user_id: str,
     task_id: int,
     current_user: str = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> TaskToggleResponse:
     """Toggle task completion status."""
     verify_user_access(current_user, user_id)
-    task = get_task_or_404(session, task_id, user_id)
+    task = await get_task_or_404(session, task_id, user_id)
     
     task.completed = not task.completed
     task.mark_updated()
     session.add(task)
-    session.commit()
+    await session.commit()
     
     # Publish event
-    dapr_client.publish_event("task.updated", task.model_dump(mode='json'))
+    await dapr_client.publish_event_async("task.updated", task.model_dump(mode='json'))
     
     status = "completed" if task.completed else "pending"
     return TaskToggleResponse(
@@ -1,15 +1,19 @@
 
 import re
-import json
+import orjson
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import Task
 from app.ai.engine import dual_provider_chat, extract_json
 
 
 class BaseSkill:
-    """Base class for all agent skills."""
+    """
+    Base class for all agent skills.
+    Skills that only inspect text override execute as a plain def (no coroutine
+    per call); skills that do I/O keep it async.
+    """
     name: str = "base_skill"
     description: str = "Base skill description"
 
@@ -17,36 +21,51 @@ class BaseSkill:
         raise NotImplementedError
 
 
+# Urdu Unicode block: 0600–06FF. In UTF-8 those code points (and only those)
+# start with lead bytes D8–DB, so detection is a C-level bytes.translate that
+# deletes every other byte value - no regex engine involved.
+_NON_URDU_BYTES = bytes(b for b in range(256) if not 0xD8 <= b <= 0xDB)
+
+
 class LangDetectorSkill(BaseSkill):
     """Detects whether text is Urdu or English."""
     name = "lang_detector"
     description = "Detects if text contains Urdu characters"
 
-    async def execute(self, content: str, **kwargs) -> str:
-        # Urdu Unicode block: 0600–06FF
-        urdu_pattern = re.compile(r'[\u0600-\u06FF]')
-        if urdu_pattern.search(content):
+    def execute(self, content: str, **kwargs) -> str:
+        # Most messages are plain English: isascii() answers without encoding
+        if content.isascii():
+            return "en"
+        if content.encode("utf-8", "surrogatepass").translate(None, _NON_URDU_BYTES):
             return "ur"
         return "en"
 
 
+HIGH_KEYWORDS = ('urgent', 'asap', 'immediate', 'today', 'critical', 'important', 'ضروری', 'آج')
+MEDIUM_KEYWORDS = ('tomorrow', 'week', 'soon', 'later', 'کل')
+LOW_KEYWORDS = ('someday', 'maybe', 'wish', 'whenever', 'کبھی')
+
+
+def _keyword_pattern(keywords) -> "re.Pattern[str]":
+    """One case-insensitive alternation, so the text is scanned once and never lowercased."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
 class PrioritySuggesterSkill(BaseSkill):
     """Suggests task priority based on keywords."""
     name = "priority_suggester"
     description = "Suggests priority (high, medium, low) based on intent"
 
-    async def execute(self, content: str, **kwargs) -> str:
-        content_lower = content.lower()
-        
-        high_keywords = ['urgent', 'asap', 'immediate', 'today', 'critical', 'important', 'ضروری', 'آج']
-        medium_keywords = ['tomorrow', 'week', 'soon', 'later', 'کل']
-        low_keywords = ['someday', 'maybe', 'wish', 'whenever', 'کبھی']
+    high_keywords = _keyword_pattern(HIGH_KEYWORDS)
+    medium_keywords = _keyword_pattern(MEDIUM_KEYWORDS)
+    low_keywords = _keyword_pattern(LOW_KEYWORDS)
 
-        if any(k in content_lower for k in high_keywords):
+    def execute(self, content: str, **kwargs) -> str:
+        if self.high_keywords.search(content):
             return "high"
-        if any(k in content_lower for k in medium_keywords):
+        if self.medium_keywords.search(content):
             return "medium"
-        if any(k in content_lower for k in low_keywords):
+        if self.low_keywords.search(content):
             return "low"
             
         return "medium"  # Default
@@ -57,30 +76,22 @@ class ReminderSchedulerSkill(BaseSkill):
     name = "reminder_scheduler"
     description = "Parses simple recurrence logic or due dates"
 
-    async def execute(self, content: str, **kwargs) -> Optional[datetime]:
-        content_lower = content.lower()
-        now = datetime.now()
+    # All reminder phrases in one scan; findall yields the group per hit, so
+    # "tomorrow"/"کل" give their text and "next week" gives ""
+    _REMINDER_RE = re.compile(r'(tomorrow|کل)|next week', re.IGNORECASE)
 
-        if 'tomorrow' in content_lower or 'کل' in content_lower:
+    def execute(self, content: str, **kwargs) -> Optional[datetime]:
+        hits = self._REMINDER_RE.findall(content)
+        if not hits:
+            return None
+
+        now = datetime.now()
+        if any(hits):  # tomorrow wins over next week
             return now + timedelta(days=1)
-        if 'next week' in content_lower:
-            return now + timedelta(weeks=1)
-        if 'usage' in content_lower: # Example placehoder logic
-             pass
-             
-        return None
+        return now + timedelta(weeks=1)
 
 
-class DeploymentBlueprintSkill(BaseSkill):
-    """Generates K8s deployment blueprints."""
-    name = "deployment_blueprint"
-    description = "Generates K8s YAML for deployments"
-
-    async def execute(self, content: str, **kwargs) -> str:
-        content_lower = content.lower()
-        
-        if 'minimal' in content_lower:
-            return """
+_MINIMAL_POD_YAML = """
 apiVersion: v1
 kind: Pod
 metadata:
@@ -90,10 +101,31 @@ spec:
   - name: nginx
     image: nginx:alpine
 """
-        if 'scale' in content_lower:
-             return "kubectl scale deployment frontend --replicas=3"
-             
-        return "Available blueprints: minimal-pod, scale-deployment"
+_SCALE_CMD = "kubectl scale deployment frontend --replicas=3"
+_BLUEPRINTS_MSG = "Available blueprints: minimal-pod, scale-deployment"
+
+
+class DeploymentBlueprintSkill(BaseSkill):
+    """Generates K8s deployment blueprints."""
+    name = "deployment_blueprint"
+    description = "Generates K8s YAML for deployments"
+
+    # One scan for both keywords; "minimal" wins if both appear, as before
+    _BLUEPRINT_RE = re.compile(r'(minimal)|scale', re.IGNORECASE)
+
+    def execute(self, content: str, **kwargs) -> str:
+        hits = self._BLUEPRINT_RE.findall(content)
+        if not hits:
+            return _BLUEPRINTS_MSG
+        return _MINIMAL_POD_YAML if any(hits) else _SCALE_CMD
+
+
+# Body of a ```/```json fence; an unclosed fence runs to the end of the text
+FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+
+
+# Shared immutable default for plan items without tags (serialized as [] by the JSON column)
+_EMPTY_TAGS: tuple = ()
 
 
 class DayPlannerSkill(BaseSkill):
@@ -102,7 +134,7 @@ class DayPlannerSkill(BaseSkill):
     description = "Create a schedule of tasks for the day"
 
     async def execute(self, content: str, **kwargs) -> str:
-        session: Session = kwargs.get('session')
+        session: AsyncSession = kwargs.get('session')
         user_id: str = kwargs.get('user_id')
         
         if not session or not user_id:
@@ -132,41 +164,39 @@ Example Output:
         ]
         
         try:
-            response_text, _ = await dual_provider_chat(messages)
+            # The planner prompt carries no user ID, so a semantic cache hit could
+            # hand this user another user's plan (and insert it as their tasks)
+            response_text, _ = await dual_provider_chat(messages, semantic_cache=False)
             
-            # Extract JSON
-            json_str = response_text.strip()
-            if "```json" in json_str:
-                json_str = json_str.split("```json")[1].split("```")[0].strip()
-            elif "```" in json_str:
-                json_str = json_str.split("```")[1].split("```")[0].strip()
+            # Extract JSON (body of the first code fence, if any)
+            fence = FENCE_RE.search(response_text)
+            json_str = fence.group(1) if fence else response_text.strip()
             
-            tasks_data = json.loads(json_str)
+            tasks_data = orjson.loads(json_str)
             
             if not isinstance(tasks_data, list):
                 return f"Error: AI returned {type(tasks_data)}, expected list."
                 
-            created_count = 0
-            titles = []
-            
-            for task_data in tasks_data:
-                task = Task(
+            tasks = [
+                Task(
                     title=task_data.get("title", "Untitled"),
                     description=task_data.get("description", ""),
                     priority=task_data.get("priority", "medium"),
-                    tags=task_data.get("tags", []),
+                    tags=task_data.get("tags") or _EMPTY_TAGS,
                     user_id=user_id,
                 )
-                session.add(task)
-                titles.append(task.title)
-                created_count += 1
-                
-            session.commit()
+                for task_data in tasks_data
+            ]
             
-            if created_count == 0:
+            if not tasks:
                 return "No tasks identified in your request."
-                
-            return f"I've created {created_count} tasks for you: {', '.join(titles)}."
+            
+            # One flush: the INSERTs go out as a single batched statement
+            session.add_all(tasks)
+            await session.commit()
+            
+            titles = [task.title for task in tasks]
+            return f"I've created {len(tasks)} tasks for you: {', '.join(titles)}."
             
         except Exception as e:
             return f"Failed to generate plan: {str(e)}"
@@ -180,3 +210,6 @@ AVAILABLE_SKILLS = {
     "deployment_blueprint": DeploymentBlueprintSkill(),
     "day_planner": DayPlannerSkill(),
 }
+
+# Bound execute methods, created once: dispatch is a dict lookup and a direct call
+SKILL_EXECUTORS = {name: skill.execute for name, skill in AVAILABLE_SKILLS.items()}
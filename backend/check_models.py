@@ -2,7 +2,8 @@
 import asyncio
 import os
 import google.generativeai as genai
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,14 +17,16 @@ async def check_gemini():
 
     genai.configure(api_key=api_key)
     try:
+        # list_models() pages over blocking HTTP; run it in a thread so OpenRouter isn't held up
+        models = await asyncio.to_thread(lambda: list(genai.list_models()))
         print("Listing available Gemini models:")
-        for m in genai.list_models():
+        for m in models:
             if 'generateContent' in m.supported_generation_methods:
                 print(f" - {m.name}")
         
         # Test generation with a safe default
         model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content("Hello")
+        response = await model.generate_content_async("Hello")
         print(f"Test generation (gemini-1.5-flash): Success - {response.text[:20]}...")
     except Exception as e:
         print(f"Gemini Error: {e}")
@@ -38,7 +41,11 @@ async def check_openrouter():
     client = AsyncOpenAI(
         base_url="https://openrouter.ai/api/v1",
         api_key=api_key,
-        default_headers={"HTTP-Referer": "http://localhost:3000", "X-Title": "TodoEvolve Test"}
+        default_headers={"HTTP-Referer": "http://localhost:3000", "X-Title": "TodoEvolve Test"},
+        http_client=DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+        ),
     )
     
     # Test standard Llama 3.3 (Paid/Credit based)
@@ -54,8 +61,8 @@ async def check_openrouter():
         print(f"Error testing {model}: {e}")
 
 async def main():
-    await check_gemini()
-    await check_openrouter()
+    # Independent network checks: total time is the slower of the two
+    await asyncio.gather(check_gemini(), check_openrouter())
 
 if __name__ == "__main__":
     asyncio.run(main())
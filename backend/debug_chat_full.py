@@ -2,8 +2,9 @@
 import asyncio
 import os
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
-import json
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import orjson
 
 # Mock MCP Server import logic (since we can't easily import app.ai.mcp_server due to relative imports)
 # We will copy the critical logic here to replicate the environment exactly
@@ -20,13 +21,10 @@ tools = [
 ]
 
 def get_tool_definitions(tools):
-    defs = []
-    for t in tools:
-        defs.append(f"Tool: {t.name}")
-        defs.append(f"Description: {t.description}")
-        defs.append(f"Input Schema: {json.dumps(t.inputSchema)}")
-        defs.append("---")
-    return "\n".join(defs)
+    return "\n".join(
+        f"Tool: {t.name}\nDescription: {t.description}\nInput Schema: {orjson.dumps(t.inputSchema).decode()}\n---"
+        for t in tools
+    )
 
 SYSTEM_PROMPT_TEMPLATE = """You are TodoEvolve, a smart, productivity-focused AI assistant.
 Your goal is to help users manage their tasks efficiently.
@@ -52,10 +50,18 @@ User ID: user_123
 Language: en
 """
 
+# tools and the template are constant, so the system prompt is rendered once
+SYSTEM_INSTRUCTION = SYSTEM_PROMPT_TEMPLATE.format(tool_definitions=get_tool_definitions(tools))
+
 load_dotenv()
 client = AsyncOpenAI(
     base_url="https://openrouter.ai/api/v1",
-    api_key=os.environ.get("OPEN_ROUTER_KEY")
+    api_key=os.environ.get("OPEN_ROUTER_KEY"),
+    # HTTP/2 + keep-alive: follow-up requests reuse the first TLS session
+    http_client=DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+    ),
 )
 
 MODEL_NAME = "google/gemma-3-27b-it:free"
@@ -63,11 +69,8 @@ MODEL_NAME = "google/gemma-3-27b-it:free"
 async def test():
     print(f"Testing Model: {MODEL_NAME}")
     
-    tool_defs = get_tool_definitions(tools)
-    system_instruction = SYSTEM_PROMPT_TEMPLATE.format(tool_definitions=tool_defs)
-    
     messages = [
-        {"role": "system", "content": system_instruction},
+        {"role": "system", "content": SYSTEM_INSTRUCTION},
         {"role": "user", "content": "Create a task called 'Debug Test'"}
     ]
     
@@ -2,8 +2,9 @@
 import asyncio
 import os
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
-import json
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import orjson
 
 # Mock MCP Server import logic
 from mcp.types import Tool
@@ -13,13 +14,10 @@ tools = [
 ]
 
 def get_tool_definitions(tools):
-    defs = []
-    for t in tools:
-        defs.append(f"Tool: {t.name}")
-        defs.append(f"Description: {t.description}")
-        defs.append(f"Input Schema: {json.dumps(t.inputSchema)}")
-        defs.append("---")
-    return "\n".join(defs)
+    return "\n".join(
+        f"Tool: {t.name}\nDescription: {t.description}\nInput Schema: {orjson.dumps(t.inputSchema).decode()}\n---"
+        for t in tools
+    )
 
 SYSTEM_PROMPT_TEMPLATE = """You are TodoEvolve.
 You have access to the following tools:
@@ -29,10 +27,22 @@ To use a tool, you MUST reply with a valid JSON object:
 {{ "tool": "tool_name", "arguments": {{ ... }} }}
 """
 
+# tools and the template are constant, so the system prompt is rendered once
+SYSTEM_INSTRUCTION = SYSTEM_PROMPT_TEMPLATE.format(tool_definitions=get_tool_definitions(tools))
+
 load_dotenv()
 client = AsyncOpenAI(
     base_url="https://openrouter.ai/api/v1",
-    api_key=os.environ.get("OPEN_ROUTER_KEY")
+    api_key=os.environ.get("OPEN_ROUTER_KEY"),
+    default_headers={
+        "HTTP-Referer": "http://localhost:3000",
+        "X-Title": "TodoEvolve"
+    },
+    # HTTP/2 + keep-alive: follow-up requests reuse the first TLS session
+    http_client=DefaultAsyncHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30),
+    ),
 )
 
 MODEL_NAME = "meta-llama/llama-3.3-70b-instruct:free"
@@ -43,18 +53,15 @@ def extract_json(text: str):
             text = text.split("```json")[1].split("```")[0].strip()
         elif "```" in text:
              text = text.split("```")[1].split("```")[0].strip()
-        return json.loads(text)
+        return orjson.loads(text)
     except:
         return None
 
 async def test():
     print(f"Testing Model: {MODEL_NAME}")
     
-    tool_defs = get_tool_definitions(tools)
-    system_instruction = SYSTEM_PROMPT_TEMPLATE.format(tool_definitions=tool_defs)
-    
     messages = [
-        {"role": "system", "content": system_instruction},
+        {"role": "system", "content": SYSTEM_INSTRUCTION},
         {"role": "user", "content": "Create a task called 'Debug Loop Task'"}
     ]
     
@@ -63,11 +70,7 @@ async def test():
         response = await client.chat.completions.create(
             model=MODEL_NAME,
             messages=messages,
-            temperature=0.7,
-            extra_headers={
-                "HTTP-Referer": "http://localhost:3000",
-                "X-Title": "TodoEvolve"
-            }
+            temperature=0.7
         )
         ai_message = response.choices[0].message.content
         print(f"First Response: {ai_message}")
@@ -80,16 +83,12 @@ async def test():
             
             # Prepare Second Call
             messages.append({"role": "assistant", "content": ai_message})
-            messages.append({"role": "user", "content": f"Tool Output: {json.dumps(tool_result)}\n\nPlease acknowledge nicely."})
+            messages.append({"role": "user", "content": f"Tool Output: {orjson.dumps(tool_result, default=str, option=orjson.OPT_NAIVE_UTC).decode()}\n\nPlease acknowledge nicely."})
             
             print("Sending SECOND Request (Confirmation)...")
             final_response = await client.chat.completions.create(
                 model=MODEL_NAME,
-                messages=messages,
-                extra_headers={
-                    "HTTP-Referer": "http://localhost:3000",
-                    "X-Title": "TodoEvolve"
-                }
+                messages=messages
             )
             print("Final Response:", final_response.choices[0].message.content)
             
@@ -1,23 +1,32 @@
 import httpx
 import asyncio
+import orjson
 
 async def main():
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(http2=True) as client:
             resp = await client.get("https://openrouter.ai/api/v1/models")
-            data = resp.json()
-            found = False
-            print("--- Valid Gemini Free Models ---")
+            data = orjson.loads(resp.content)
+            
+            # One pass over the catalogue, sorted into both lists
+            gemini, deepseek = [], []
             for m in data['data']:
-                if "gemini" in m['id'].lower() and "free" in m['id'].lower():
-                    print(m['id'])
-                    found = True
+                model_id = m['id']
+                lowered = model_id.lower()
+                if "free" not in lowered:
+                    continue
+                if "gemini" in lowered:
+                    gemini.append(model_id)
+                if "deepseek" in lowered:
+                    deepseek.append(model_id)
+            
+            print("--- Valid Gemini Free Models ---")
+            for model_id in gemini:
+                print(model_id)
             
             print("--- Valid DeepSeek Free Models ---")
-            for m in data['data']:
-                if "deepseek" in m['id'].lower() and "free" in m['id'].lower():
-                    print(m['id'])
-                    found = True
+            for model_id in deepseek:
+                print(model_id)
 
     except Exception as e:
         print(f"Error: {e}")
@@ -18,6 +18,8 @@ class LangDetectorSkill:
     
     # Urdu Unicode range
     URDU_PATTERN = re.compile(r'[\u0600-\u06FF\u0750-\u077F\uFB50-\uFDFF\uFE70-\uFEFF]')
+    # Same ranges matched as runs, so counting creates one match per word, not per char
+    _URDU_RUNS = re.compile(URDU_PATTERN.pattern + '+')
     
     @classmethod
     def detect(cls, text: str) -> Literal["ur", "en"]:
@@ -30,12 +32,13 @@ class LangDetectorSkill:
         Returns:
             "ur" for Urdu, "en" for English
         """
-        if not text or not text.strip():
+        if not text or text.isascii():
+            # Empty or pure-ASCII input can't contain Urdu
             return "en"
         
         # Count Urdu characters
-        urdu_chars = len(cls.URDU_PATTERN.findall(text))
-        total_chars = len(text.replace(" ", ""))
+        urdu_chars = sum(m.end() - m.start() for m in cls._URDU_RUNS.finditer(text))
+        total_chars = len(text) - text.count(" ")
         
         if total_chars == 0:
             return "en"
@@ -11,6 +11,10 @@ from typing import Literal, List
 from datetime import datetime, timedelta
 
 
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(k.lower()) for k in keywords))
+
+
 class TaskPrioritySkill:
     """
     Suggests task priority based on content analysis.
@@ -44,6 +48,33 @@ class TaskPrioritySkill:
         r"by \d{1,2}:\d{2}",
     ]
     
+    # Each list compiled into one alternation, so a category is found in a
+    # single scan of the text instead of one substring search per keyword
+    _HIGH_RE = _keyword_pattern(HIGH_PRIORITY_KEYWORDS)
+    _LOW_RE = _keyword_pattern(LOW_PRIORITY_KEYWORDS)
+    _TIME_RE = re.compile("|".join(f"(?:{p})" for p in TIME_PATTERNS), re.IGNORECASE)
+    
+    @classmethod
+    def _scan(cls, task_title: str, task_description: str) -> tuple:
+        """Return (priority, reasons) from a single pass per keyword category."""
+        text = f"{task_title} {task_description}".lower()
+        
+        keyword = cls._HIGH_RE.search(text)
+        time_sensitive = cls._TIME_RE.search(text)
+        if keyword or time_sensitive:
+            reasons = []
+            if keyword:
+                reasons.append(f"Contains keyword: '{keyword.group()}'")
+            if time_sensitive:
+                reasons.append("Time-sensitive task")
+            return "high", reasons
+        
+        keyword = cls._LOW_RE.search(text)
+        if keyword:
+            return "low", [f"Contains keyword: '{keyword.group()}'"]
+        
+        return "medium", ["No priority indicators found"]
+    
     @classmethod
     def suggest(cls, task_title: str, task_description: str = "") -> Literal["high", "medium", "low"]:
         """
@@ -56,25 +87,7 @@ class TaskPrioritySkill:
         Returns:
             Suggested priority: "high", "medium", or "low"
         """
-        text = f"{task_title} {task_description}".lower()
-        
-        # Check for high priority keywords
-        for keyword in cls.HIGH_PRIORITY_KEYWORDS:
-            if keyword.lower() in text:
-                return "high"
-        
-        # Check for time-sensitive patterns
-        for pattern in cls.TIME_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return "high"
-        
-        # Check for low priority keywords
-        for keyword in cls.LOW_PRIORITY_KEYWORDS:
-            if keyword.lower() in text:
-                return "low"
-        
-        # Default to medium
-        return "medium"
+        return cls._scan(task_title, task_description)[0]
     
     @classmethod
     def analyze(cls, task_title: str, task_description: str = "") -> dict:
@@ -84,27 +97,7 @@ class TaskPrioritySkill:
         Returns:
             Dict with priority and reasoning
         """
-        priority = cls.suggest(task_title, task_description)
-        text = f"{task_title} {task_description}".lower()
-        
-        reasons = []
-        
-        if priority == "high":
-            for keyword in cls.HIGH_PRIORITY_KEYWORDS:
-                if keyword.lower() in text:
-                    reasons.append(f"Contains keyword: '{keyword}'")
-                    break
-            for pattern in cls.TIME_PATTERNS:
-                if re.search(pattern, text, re.IGNORECASE):
-                    reasons.append("Time-sensitive task")
-                    break
-        elif priority == "low":
-            for keyword in cls.LOW_PRIORITY_KEYWORDS:
-                if keyword.lower() in text:
-                    reasons.append(f"Contains keyword: '{keyword}'")
-                    break
-        else:
-            reasons.append("No priority indicators found")
+        priority, reasons = cls._scan(task_title, task_description)
         
         return {
             "priority": priority,
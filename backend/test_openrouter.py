@@ -21,9 +21,14 @@ try:
         "role": "user",
         "content": "Hello, are you online?"
         }
-    ]
+    ],
+    stream=True,
+    timeout=10.0
     )
-    print(completion.choices[0].message.content)
+    for chunk in completion:
+        if chunk.choices:
+            print(chunk.choices[0].delta.content or "", end="", flush=True)
+    print()
     print("SUCCESS")
 except Exception as e:
     print(f"ERROR: {e}")
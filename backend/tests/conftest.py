@@ -0,0 +1,65 @@
+# TodoEvolve Backend - Test Fixtures
+
+"""
+Shared fixtures: a throwaway SQLite database wired into the app's session
+dependencies, and a TestClient with authentication overridden.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.auth import get_current_user
+from app.database import get_async_session, get_session
+from app.main import app
+from app.models import User
+
+TEST_USER_ID = "1"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Sync engine on a fresh SQLite file with all tables created."""
+    db_engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    SQLModel.metadata.create_all(db_engine)
+    yield db_engine
+    db_engine.dispose()
+
+
+@pytest.fixture
+def user(engine) -> User:
+    """The authenticated test user (id TEST_USER_ID)."""
+    with Session(engine) as session:
+        db_user = User(id=int(TEST_USER_ID), email="user@example.com", hashed_password="x", is_verified=True)
+        session.add(db_user)
+        session.commit()
+        session.refresh(db_user)
+        return db_user
+
+
+@pytest.fixture
+def client(engine, tmp_path):
+    """TestClient on the test database, authenticated as TEST_USER_ID."""
+    # NullPool: each request runs on its own event loop, so connections can't be shared
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+
+    def override_session():
+        with Session(engine) as session:
+            yield session
+
+    async def override_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_async_session] = override_async_session
+    app.dependency_overrides[get_current_user] = lambda: TEST_USER_ID
+    # No `with`: the lifespan (real database setup, background tasks) isn't run
+    yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,76 @@
+# TodoEvolve Backend - Tests
+
+"""
+Unit tests for access tokens: the hand-signed HS256 tokens from
+create_access_token must be standard JWTs that PyJWT and decode_token accept.
+"""
+
+import time
+
+import jwt
+import pytest
+
+from app.auth import AuthError, decode_token
+from app.config import get_settings
+from app.routes import auth as auth_routes
+from app.routes.auth import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
+
+SECRET = get_settings().better_auth_secret
+
+
+class TestCreateAccessToken:
+    """Tests for create_access_token."""
+
+    def test_round_trips_through_pyjwt(self):
+        """PyJWT verifies the signature and returns the claims."""
+        token = create_access_token(42, "user@example.com")
+        payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+        assert payload["sub"] == "42"
+        assert payload["email"] == "user@example.com"
+        assert payload["type"] == "access"
+
+    def test_header(self):
+        """The header declares HS256 JWT."""
+        token = create_access_token(1, "user@example.com")
+        assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+    def test_expiry(self):
+        """exp is ACCESS_TOKEN_EXPIRE_MINUTES from now."""
+        before = int(time.time())
+        payload = jwt.decode(create_access_token(1, "a@b.co"), SECRET, algorithms=["HS256"])
+        assert before + ACCESS_TOKEN_EXPIRE_MINUTES * 60 <= payload["exp"] <= int(time.time()) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    def test_non_ascii_email(self):
+        """Non-ASCII claims survive the orjson/base64url encoding."""
+        token = create_access_token(7, "صارف@example.com")
+        assert jwt.decode(token, SECRET, algorithms=["HS256"])["email"] == "صارف@example.com"
+
+    def test_wrong_secret_rejected(self):
+        """A different key fails verification."""
+        token = create_access_token(1, "user@example.com")
+        with pytest.raises(jwt.InvalidSignatureError):
+            jwt.decode(token, SECRET + "x", algorithms=["HS256"])
+
+
+class TestDecodeToken:
+    """Tests for decode_token with tokens issued by the auth routes."""
+
+    def test_accepts_issued_token(self):
+        """Tokens from create_access_token authenticate."""
+        payload = decode_token(create_access_token(5, "user@example.com"))
+        assert payload["sub"] == "5"
+
+    def test_rejects_tampered_token(self):
+        """Changing the payload invalidates the signature."""
+        header, _, signature = create_access_token(5, "user@example.com").split(".")
+        forged = jwt.utils.base64url_encode(b'{"sub":"6","type":"access","exp":9999999999}').decode()
+        with pytest.raises(AuthError):
+            decode_token(f"{header}.{forged}.{signature}")
+
+    def test_rejects_expired_token(self, monkeypatch):
+        """Expired tokens fail even though the signature is valid."""
+        monkeypatch.setattr(auth_routes.time, "time", lambda: 1_000_000)
+        token = create_access_token(5, "user@example.com")
+        monkeypatch.undo()
+        with pytest.raises(AuthError, match="expired"):
+            decode_token(token)
@@ -0,0 +1,73 @@
+# TodoEvolve Backend - Tests
+
+"""
+Tests for POST /auth/upload-avatar: type detection by magic bytes, the size
+limit, and content-addressed storage.
+"""
+
+import os
+
+import pytest
+
+from app.routes import auth as auth_routes
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "avatars"
+    directory.mkdir()
+    monkeypatch.setattr(auth_routes, "UPLOAD_DIR", str(directory))
+    return directory
+
+
+def _upload(client, content: bytes, filename: str = "avatar.png", content_type: str = "image/png"):
+    return client.post("/auth/upload-avatar", files={"file": (filename, content, content_type)})
+
+
+class TestUploadAvatar:
+    """Tests for avatar uploads."""
+
+    def test_png_accepted(self, client, user, upload_dir):
+        """A PNG is stored under its content hash and set on the profile."""
+        response = _upload(client, PNG)
+        assert response.status_code == 200
+        stored = os.listdir(upload_dir)
+        assert len(stored) == 1 and stored[0].endswith(".png")
+        assert response.json()["profile_picture"].endswith(f"/static/uploads/avatars/{stored[0]}")
+
+    def test_jpeg_accepted(self, client, user, upload_dir):
+        """A JPEG gets a .jpg name regardless of the client's filename."""
+        response = _upload(client, JPEG, filename="photo.png", content_type="image/png")
+        assert response.status_code == 200
+        assert os.listdir(upload_dir)[0].endswith(".jpg")
+
+    def test_type_from_magic_bytes_not_header(self, client, user, upload_dir):
+        """Non-image content is rejected even when labelled as an image."""
+        response = _upload(client, b"<svg onload=alert(1)>", filename="x.png", content_type="image/png")
+        assert response.status_code == 400
+        assert os.listdir(upload_dir) == []
+
+    def test_empty_file_rejected(self, client, user, upload_dir):
+        """An empty upload has no magic bytes and is rejected."""
+        assert _upload(client, b"").status_code == 400
+
+    def test_oversized_rejected(self, client, user, upload_dir):
+        """Files over MAX_AVATAR_BYTES get 413 and nothing is written."""
+        response = _upload(client, PNG + b"\x00" * auth_routes.MAX_AVATAR_BYTES)
+        assert response.status_code == 413
+        assert os.listdir(upload_dir) == []
+
+    def test_limit_is_inclusive(self, client, user, upload_dir):
+        """A file of exactly MAX_AVATAR_BYTES is accepted."""
+        content = PNG + b"\x00" * (auth_routes.MAX_AVATAR_BYTES - len(PNG))
+        assert _upload(client, content).status_code == 200
+
+    def test_identical_uploads_share_one_file(self, client, user, upload_dir):
+        """Re-uploading the same image reuses the stored file."""
+        first = _upload(client, PNG).json()["profile_picture"]
+        second = _upload(client, PNG).json()["profile_picture"]
+        assert first == second
+        assert len(os.listdir(upload_dir)) == 1
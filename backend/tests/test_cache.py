@@ -0,0 +1,196 @@
+# TodoEvolve Backend - Tests
+
+"""
+Unit tests for the LLM response cache (exact and semantic layers).
+The embedding model is replaced by fixed vectors so no model is downloaded.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.ai import cache as cache_module
+from app.ai import engine
+from app.ai.cache import TOOL_OUTPUT_PREFIX, LLMSemanticCache
+from app.skills import DayPlannerSkill
+
+
+SYSTEM = {"role": "system", "content": "User ID: user-1\nLanguage: en"}
+
+# Unit vectors: "close" is a paraphrase of "base" (cosine ~0.95), "far" is unrelated
+VECTORS = {
+    "base": [1.0, 0.0, 0.0],
+    "close": [0.95, 0.312, 0.0],
+    "far": [0.0, 0.0, 1.0],
+}
+TOOL_CALL = '{"tool": "list_tasks", "arguments": {}}'
+
+
+def _messages(text: str, system: dict = SYSTEM) -> list:
+    return [system, {"role": "user", "content": text}]
+
+
+def _fake_embed(text: str):
+    # Tool outputs with different data would still embed almost identically
+    key = "base" if text.startswith(TOOL_OUTPUT_PREFIX) else text
+    vec = np.asarray(VECTORS[key], dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _make_cache(monkeypatch, semantic: bool = True, **kwargs) -> LLMSemanticCache:
+    monkeypatch.setattr(cache_module, "SEMANTIC_CACHE_AVAILABLE", semantic)
+    cache = LLMSemanticCache(**kwargs)
+    cache._embed_sync = _fake_embed
+    return cache
+
+
+def _fake_providers(monkeypatch, replies: list) -> list:
+    """Route dual_provider_chat to canned replies; returns the list of prompts sent."""
+    sent = []
+
+    async def fake_chat(messages, max_retries, temperature):
+        sent.append(messages)
+        return replies[len(sent) - 1], "model"
+
+    monkeypatch.setattr(engine, "_hedging_enabled", lambda: False)
+    monkeypatch.setattr(engine, "_sequential_chat", fake_chat)
+    return sent
+
+
+def _tool_turn(titles: list) -> list:
+    """Messages for the summary turn after a list_tasks call returned `titles`."""
+    return _messages("base") + [
+        {"role": "assistant", "content": TOOL_CALL},
+        {"role": "user", "content": f"{TOOL_OUTPUT_PREFIX} {titles}"},
+    ]
+
+
+class FakeSession:
+    """Records the tasks a skill would insert."""
+
+    def __init__(self) -> None:
+        self.added = []
+
+    def add_all(self, items) -> None:
+        self.added.extend(items)
+
+    async def commit(self) -> None:
+        pass
+
+
+class TestExactLayer:
+    """Tests for the exact-match layer."""
+
+    async def test_hit_for_identical_messages(self, monkeypatch):
+        """Deterministic calls with identical messages are served from cache."""
+        cache = _make_cache(monkeypatch, semantic=False)
+        await cache.set(_messages("base"), 0, ("answer", "model"))
+        assert await cache.get(_messages("base"), 0) == ("answer", "model")
+
+    async def test_only_for_temperature_zero(self, monkeypatch):
+        """Sampled (temperature > 0) calls never use the exact layer."""
+        cache = _make_cache(monkeypatch, semantic=False)
+        await cache.set(_messages("base"), 0.7, ("answer", "model"))
+        assert await cache.get(_messages("base"), 0.7) is None
+
+    async def test_expired_entry_is_ignored(self, monkeypatch):
+        """Entries past their TTL are not returned."""
+        cache = _make_cache(monkeypatch, semantic=False, ttl=-1)
+        await cache.set(_messages("base"), 0, ("answer", "model"))
+        assert await cache.get(_messages("base"), 0) is None
+
+
+class TestSemanticLayer:
+    """Tests for the embedding-similarity layer."""
+
+    async def test_paraphrase_hits(self, monkeypatch):
+        """A turn above the similarity threshold returns the cached reply."""
+        cache = _make_cache(monkeypatch)
+        await cache.set(_messages("base"), 0.7, ("answer", "model"))
+        assert await cache.get(_messages("close"), 0.7) == ("answer", "model")
+
+    async def test_unrelated_turn_misses(self, monkeypatch):
+        """A turn below the threshold is not served."""
+        cache = _make_cache(monkeypatch)
+        await cache.set(_messages("base"), 0.7, ("answer", "model"))
+        assert await cache.get(_messages("far"), 0.7) is None
+
+    async def test_scoped_to_context(self, monkeypatch):
+        """Matches are limited to turns with the same system prompt and history."""
+        cache = _make_cache(monkeypatch)
+        await cache.set(_messages("base"), 0.7, ("answer", "model"))
+        other_user = {"role": "system", "content": "User ID: user-2\nLanguage: en"}
+        assert await cache.get(_messages("base", other_user), 0.7) is None
+
+    async def test_expired_entry_is_ignored(self, monkeypatch):
+        """Semantic entries past their TTL are not returned."""
+        cache = _make_cache(monkeypatch, ttl=-1)
+        await cache.set(_messages("base"), 0.7, ("answer", "model"))
+        assert await cache.get(_messages("close"), 0.7) is None
+
+    async def test_semantic_false_skips_layer(self, monkeypatch):
+        """set(semantic=False) keeps the reply out of the semantic layer."""
+        cache = _make_cache(monkeypatch)
+        await cache.set(_messages("base"), 0.7, ("answer", "model"), semantic=False)
+        assert await cache.get(_messages("close"), 0.7) is None
+
+
+class TestEngineCaching:
+    """Tests for what the provider layer stores in the cache."""
+
+    async def test_tool_call_not_served_for_paraphrase(self, monkeypatch):
+        """A cached tool call is never replayed for a similar-looking request."""
+        cache = _make_cache(monkeypatch)
+        monkeypatch.setattr(engine, "response_cache", cache)
+        tool_call = '{"tool": "delete_task", "arguments": {"task_id": 5}}'
+        await engine._cache_response(_messages("base"), 0.7, tool_call, "model")
+        assert await cache.get(_messages("close"), 0.7) is None
+
+    async def test_text_reply_served_for_paraphrase(self, monkeypatch):
+        """Plain text replies still use the semantic layer."""
+        cache = _make_cache(monkeypatch)
+        monkeypatch.setattr(engine, "response_cache", cache)
+        await engine._cache_response(_messages("base"), 0.7, "Hello!", "model")
+        assert await cache.get(_messages("close"), 0.7) == ("Hello!", "model")
+
+    async def test_tool_outputs_never_share_an_entry(self, monkeypatch):
+        """A fresh tool output is summarized anew, not answered from the old summary."""
+        cache = _make_cache(monkeypatch)
+        monkeypatch.setattr(engine, "response_cache", cache)
+        sent = _fake_providers(monkeypatch, ["You have: Buy milk", "You have: Call mom"])
+        first = await engine.dual_provider_chat(_tool_turn(["Buy milk"]))
+        second = await engine.dual_provider_chat(_tool_turn(["Call mom"]))
+        assert first[0] == "You have: Buy milk"
+        assert second[0] == "You have: Call mom"
+        assert len(sent) == 2
+
+    async def test_semantic_cache_opt_out(self, monkeypatch):
+        """dual_provider_chat(semantic_cache=False) neither reads nor fills the semantic layer."""
+        cache = _make_cache(monkeypatch)
+        monkeypatch.setattr(engine, "response_cache", cache)
+        sent = _fake_providers(monkeypatch, ["one", "two"])
+        await engine.dual_provider_chat(_messages("base"), semantic_cache=False)
+        assert (await engine.dual_provider_chat(_messages("close"), semantic_cache=False))[0] == "two"
+        assert len(sent) == 2
+        assert await cache.get(_messages("close"), 0.7) is None
+
+
+class TestDayPlanner:
+    """The day planner's prompt has no user ID, so it must not share cached plans."""
+
+    async def test_users_do_not_receive_each_others_plans(self, monkeypatch):
+        """User B's similar request gets B's own plan, not user A's cached one."""
+        cache = _make_cache(monkeypatch)
+        monkeypatch.setattr(engine, "response_cache", cache)
+        sent = _fake_providers(monkeypatch, [
+            '[{"title": "A: dentist", "priority": "high", "tags": []}]',
+            '[{"title": "B: gym", "priority": "low", "tags": []}]',
+        ])
+        skill = DayPlannerSkill()
+        session_a, session_b = FakeSession(), FakeSession()
+
+        await skill.execute("base", session=session_a, user_id="user-a")
+        await skill.execute("close", session=session_b, user_id="user-b")
+
+        assert len(sent) == 2
+        assert [(t.user_id, t.title) for t in session_b.added] == [("user-b", "B: gym")]
@@ -0,0 +1,64 @@
+# TodoEvolve Backend - Tests
+
+"""
+Tests for the wire format of outgoing email (_build_message): CRLF line
+endings, the RFC 5322 line-length limit, and a body that parses back intact.
+"""
+
+import re
+from email import message_from_bytes, policy
+
+from app.email_utils import _MAX_LINE_OCTETS, _build_message, get_email_template
+
+BARE_LF = re.compile(rb"(?<!\r)\n")
+
+
+def _template() -> str:
+    return get_email_template(
+        title="Reset Your Password",
+        message="We received a request to reset your password.",
+        button_text="Reset Password",
+        button_url="http://localhost:3005/reset-password?token=abc",
+    )
+
+
+def _parse(raw: bytes):
+    return message_from_bytes(raw, policy=policy.SMTP)
+
+
+class TestBuildMessage:
+    """Tests for _build_message."""
+
+    def test_no_bare_lf(self):
+        """Every line feed in the message is part of a CRLF."""
+        raw = _build_message("user@example.com", "Reset Your Password", _template())
+        assert BARE_LF.search(raw) is None
+
+    def test_mixed_line_endings_normalized(self):
+        """CRLF, CR and LF in the input all become a single CRLF."""
+        raw = _build_message("user@example.com", "Hi", "one\r\ntwo\rthree\nfour")
+        assert BARE_LF.search(raw) is None
+        assert raw.endswith(b"\r\n\r\none\r\ntwo\r\nthree\r\nfour")
+
+    def test_template_body_round_trips(self):
+        """The parsed body matches the template (with CRLF line breaks)."""
+        html = _template()
+        msg = _parse(_build_message("user@example.com", "Reset Your Password", html))
+        assert msg["Content-Transfer-Encoding"] == "8bit"
+        assert msg.get_content().replace("\r\n", "\n") == html
+
+    def test_non_ascii_subject_and_body(self):
+        """Urdu text survives the header and 8bit body encoding."""
+        msg = _parse(_build_message("user@example.com", "پاس ورڈ", "<p>خوش آمدید</p>"))
+        assert msg["Subject"] == "پاس ورڈ"
+        assert "خوش آمدید" in msg.get_content()
+
+    def test_long_line_wrapped(self):
+        """A line over 998 octets switches to quoted-printable and decodes intact."""
+        html = "<p>" + "word " * 400 + "</p>\n<p>" + "x" * 2000 + "</p>"
+        raw = _build_message("user@example.com", "Hi", html)
+        assert BARE_LF.search(raw) is None
+        assert max(len(line) for line in raw.split(b"\r\n")) <= _MAX_LINE_OCTETS
+        msg = _parse(raw)
+        assert msg["Content-Transfer-Encoding"] == "quoted-printable"
+        assert msg.get_content().replace("\r\n", "\n") == html
@@ -0,0 +1,108 @@
+# TodoEvolve Backend - Tests
+
+"""
+Tests for the per-address email throttle on /auth/forgot-password and
+/auth/resend-verification.
+"""
+
+import pytest
+from cachetools import TTLCache
+from sqlmodel import Session, select
+
+from app.models import PasswordResetToken, User
+from app.routes import auth as auth_routes
+
+FORGOT_MESSAGE = "If the email exists, a reset link has been sent."
+
+
+class FakeTimer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def timer(monkeypatch):
+    """Fresh throttle cache driven by a fake clock."""
+    fake = FakeTimer()
+    monkeypatch.setattr(
+        auth_routes,
+        "_email_throttle",
+        TTLCache(maxsize=100, ttl=auth_routes.EMAIL_THROTTLE_SECONDS, timer=fake),
+    )
+    return fake
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Record emails instead of sending them."""
+    outbox = []
+    monkeypatch.setattr(auth_routes, "send_email", lambda to, subject, html: outbox.append((to, subject)))
+    monkeypatch.setattr(auth_routes, "_mask_timing", lambda: None)
+    return outbox
+
+
+def _forgot(client, email: str = "user@example.com"):
+    return client.post("/auth/forgot-password", json={"email": email})
+
+
+def _reset_tokens(engine) -> int:
+    with Session(engine) as session:
+        return len(session.exec(select(PasswordResetToken)).all())
+
+
+class TestEmailThrottle:
+    """Tests for email_throttled via the public endpoints."""
+
+    def test_repeat_within_window_sends_once(self, client, user, engine, timer, sent):
+        """A second request inside the window gets the same answer but no email or token."""
+        first = _forgot(client)
+        second = _forgot(client)
+        assert first.json()["message"] == second.json()["message"] == FORGOT_MESSAGE
+        assert len(sent) == 1
+        assert _reset_tokens(engine) == 1
+
+    def test_window_expires(self, client, user, engine, timer, sent):
+        """After EMAIL_THROTTLE_SECONDS another email can be sent."""
+        _forgot(client)
+        timer.now += auth_routes.EMAIL_THROTTLE_SECONDS - 1
+        _forgot(client)
+        assert len(sent) == 1
+        timer.now += 2
+        _forgot(client)
+        assert len(sent) == 2
+        assert _reset_tokens(engine) == 2
+
+    def test_key_ignores_email_case(self, client, user, timer, sent):
+        """Changing the address's case doesn't bypass the throttle."""
+        _forgot(client, "user@example.com")
+        _forgot(client, "USER@Example.com")
+        assert len(sent) == 1
+
+    def test_addresses_throttled_independently(self, client, user, engine, timer, sent):
+        """Throttling one address doesn't block another."""
+        with Session(engine) as session:
+            session.add(User(email="other@example.com", hashed_password="x"))
+            session.commit()
+        _forgot(client, "user@example.com")
+        _forgot(client, "other@example.com")
+        assert len(sent) == 2
+
+    def test_unknown_email_also_throttled(self, client, timer, sent):
+        """Unknown addresses use the window too, with the same generic answer."""
+        assert _forgot(client, "nobody@example.com").json()["message"] == FORGOT_MESSAGE
+        assert ("nobody@example.com", "testclient") in auth_routes._email_throttle
+        assert _forgot(client, "nobody@example.com").json()["message"] == FORGOT_MESSAGE
+        assert sent == []
+
+    def test_resend_verification_throttled(self, client, engine, timer, sent):
+        """resend-verification shares the same window."""
+        with Session(engine) as session:
+            session.add(User(email="new@example.com", hashed_password="x", is_verified=False))
+            session.commit()
+        for _ in range(3):
+            response = client.post("/auth/resend-verification", json={"email": "new@example.com"})
+            assert response.status_code == 200
+        assert len(sent) == 1
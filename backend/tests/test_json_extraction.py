@@ -0,0 +1,144 @@
+# TodoEvolve Backend - Tests
+
+"""
+Unit tests for JSON extraction from AI replies (_find_json_span, extract_json,
+extract_tool_call, IncrementalJsonParser).
+"""
+
+from app.ai.engine import (
+    IncrementalJsonParser,
+    _find_json_span,
+    extract_json,
+    extract_tool_call,
+)
+
+
+TOOL_CALL = '{"tool": "add_task", "arguments": {"title": "Buy milk"}}'
+
+
+class TestFindJsonSpan:
+    """Tests for the bracket-balanced scanner."""
+
+    def test_whole_object(self):
+        """A bare object spans the whole text."""
+        assert _find_json_span(TOOL_CALL) == (0, len(TOOL_CALL))
+
+    def test_object_inside_prose(self):
+        """Leading and trailing prose is excluded."""
+        text = f"Sure! {TOOL_CALL} Done."
+        begin, end = _find_json_span(text)
+        assert text[begin:end] == TOOL_CALL
+
+    def test_nested(self):
+        """Nested objects and arrays close at the outermost bracket."""
+        text = 'x {"a": {"b": [1, {"c": 2}]}, "d": [[]]} y'
+        begin, end = _find_json_span(text)
+        assert text[begin:end] == '{"a": {"b": [1, {"c": 2}]}, "d": [[]]}'
+
+    def test_brackets_inside_strings_ignored(self):
+        """Braces and brackets in string values don't affect depth."""
+        text = '{"title": "fix } and ] and {"} tail'
+        begin, end = _find_json_span(text)
+        assert text[begin:end] == '{"title": "fix } and ] and {"}'
+
+    def test_escaped_quotes(self):
+        """An escaped quote doesn't end the string."""
+        text = r'{"title": "say \"hi}\" now", "n": 1}'
+        assert _find_json_span(text) == (0, len(text))
+
+    def test_escaped_backslash_before_quote(self):
+        """A string ending in an escaped backslash still closes at its quote."""
+        text = r'{"path": "C:\\", "n": 1}'
+        assert _find_json_span(text) == (0, len(text))
+
+    def test_truncated(self):
+        """An object that never closes gives None."""
+        assert _find_json_span('{"tool": "add_task", "arguments": {"title": "Bu') is None
+
+    def test_no_json(self):
+        """Plain prose gives None."""
+        assert _find_json_span("Nothing to see here.") is None
+
+    def test_start_offset(self):
+        """Scanning starts at `start`."""
+        text = '{"a": 1} {"b": 2}'
+        begin, end = _find_json_span(text, 1)
+        assert text[begin:end] == '{"b": 2}'
+
+
+class TestExtractJson:
+    """Tests for extract_json."""
+
+    def test_plain_object(self):
+        """A bare JSON object is parsed."""
+        assert extract_json(TOOL_CALL)["tool"] == "add_task"
+
+    def test_fenced_block(self):
+        """JSON in a ```json fence is parsed."""
+        text = f"Here you go:\n```json\n{TOOL_CALL}\n```\n"
+        assert extract_json(text)["arguments"] == {"title": "Buy milk"}
+
+    def test_fence_preferred_over_earlier_json(self):
+        """The fenced block wins over JSON that appears before it."""
+        text = '{"draft": true}\n```json\n{"final": true}\n```'
+        assert extract_json(text) == {"final": True}
+
+    def test_skips_non_json_braces(self):
+        """Balanced but invalid spans like {placeholder} are skipped."""
+        text = 'Use {placeholder} syntax, then ' + TOOL_CALL
+        assert extract_json(text)["tool"] == "add_task"
+
+    def test_array(self):
+        """Top-level arrays are returned too."""
+        assert extract_json("ids: [1, 2, 3]") == [1, 2, 3]
+
+    def test_unicode_and_escapes(self):
+        """Escaped characters are decoded by the JSON parser."""
+        text = r'{"title": "خریداری \"دودھ\"", "n": 1}'
+        assert extract_json(text) == {"title": 'خریداری "دودھ"', "n": 1}
+
+    def test_truncated_and_empty(self):
+        """Truncated or empty input gives None."""
+        assert extract_json('{"tool": "add_task", "arguments": {') is None
+        assert extract_json("") is None
+
+
+class TestExtractToolCall:
+    """Tests for extract_tool_call."""
+
+    def test_tool_call(self):
+        """A tool-call object is returned as a dict."""
+        assert extract_tool_call(f"```json\n{TOOL_CALL}\n```")["tool"] == "add_task"
+
+    def test_prose_without_tool_key(self):
+        """Replies without a "tool" key are not parsed at all."""
+        assert extract_tool_call('Your plan: {"morning": "gym"}') is None
+
+    def test_array_is_not_a_tool_call(self):
+        """Only objects count as tool calls."""
+        assert extract_tool_call('["tool"]') is None
+
+
+class TestIncrementalJsonParser:
+    """Tests for the streaming parser."""
+
+    def test_object_split_across_chunks(self):
+        """The value is returned once the chunk that closes it arrives."""
+        parser = IncrementalJsonParser()
+        chunks = ["Sure ", '{"tool": "ad', 'd_task", "arguments": {"title": "a}', '"}}', " trailing"]
+        results = [parser.feed(c) for c in chunks]
+        assert results[:3] == [None, None, None]
+        assert results[3] == {"tool": "add_task", "arguments": {"title": "a}"}}
+        assert results[4] == results[3]
+
+    def test_escape_split_across_chunks(self):
+        """An escape at the end of one chunk applies to the next."""
+        parser = IncrementalJsonParser()
+        assert parser.feed('{"t": "a\\') is None
+        assert parser.feed('"}"}') == {"t": 'a"}'}
+
+    def test_truncated_stream(self):
+        """A stream that ends mid-object never returns a value."""
+        parser = IncrementalJsonParser()
+        assert parser.feed('{"tool": "add_task", ') is None
+        assert parser.result is None
@@ -0,0 +1,99 @@
+# TodoEvolve Backend - Tests
+
+"""
+Tests for GET /api/{user_id}/tasks: filtering, sorting and limit/offset
+pagination with `total` counting every match.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session
+
+from app.models import Task
+
+from .conftest import TEST_USER_ID
+
+URL = f"/api/{TEST_USER_ID}/tasks"
+BASE_TIME = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def seed(engine):
+    """Insert `count` tasks for the test user, created one minute apart."""
+    def _seed(count: int, **fields) -> None:
+        with Session(engine) as session:
+            session.add_all(
+                Task(
+                    user_id=TEST_USER_ID,
+                    title=f"Task {i:03d}",
+                    created_at=BASE_TIME + timedelta(minutes=i),
+                    **fields,
+                )
+                for i in range(count)
+            )
+            session.commit()
+    return _seed
+
+
+class TestListTasks:
+    """Tests for list_tasks."""
+
+    def test_no_limit_returns_every_task(self, client, seed):
+        """Without limit the whole list comes back, past the old 200 cap."""
+        seed(250)
+        data = client.get(URL).json()
+        assert data["total"] == 250
+        assert len(data["tasks"]) == 250
+
+    def test_limit_and_offset_page(self, client, seed):
+        """limit/offset select a slice in sort order; total still counts all."""
+        seed(30)
+        data = client.get(URL, params={"sort": "created_asc", "limit": 10, "offset": 10}).json()
+        assert [t["title"] for t in data["tasks"]] == [f"Task {i:03d}" for i in range(10, 20)]
+        assert data["total"] == 30
+
+    def test_offset_past_end(self, client, seed):
+        """An offset beyond the last match gives an empty page."""
+        seed(5)
+        data = client.get(URL, params={"limit": 10, "offset": 50}).json()
+        assert data["tasks"] == []
+        assert data["total"] == 5
+
+    def test_offset_without_limit(self, client, seed):
+        """offset alone skips rows and returns the rest."""
+        seed(5)
+        data = client.get(URL, params={"sort": "created_asc", "offset": 3}).json()
+        assert [t["title"] for t in data["tasks"]] == ["Task 003", "Task 004"]
+        assert data["total"] == 5
+
+    def test_total_counts_filtered_matches(self, client, seed):
+        """total reflects the filter, not the page size or the whole table."""
+        seed(8, completed=True)
+        seed(4)
+        data = client.get(URL, params={"status": "completed", "limit": 3}).json()
+        assert len(data["tasks"]) == 3
+        assert data["total"] == 8
+        assert all(t["completed"] for t in data["tasks"])
+
+    def test_other_users_tasks_excluded(self, client, seed, engine):
+        """Only the requesting user's tasks are listed or counted."""
+        seed(2)
+        with Session(engine) as session:
+            session.add(Task(user_id="someone-else", title="Hidden"))
+            session.commit()
+        assert client.get(URL).json()["total"] == 2
+
+    @pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 501}, {"offset": -1}])
+    def test_invalid_paging_rejected(self, client, params):
+        """Out-of-range limit/offset values are rejected with 422."""
+        assert client.get(URL, params=params).status_code == 422
+
+    def test_priority_sort(self, client, engine):
+        """sort=priority orders high, medium, low."""
+        with Session(engine) as session:
+            for priority in ("low", "high", "medium"):
+                session.add(Task(user_id=TEST_USER_ID, title=priority, priority=priority))
+            session.commit()
+        data = client.get(URL, params={"sort": "priority"}).json()
+        assert [t["priority"] for t in data["tasks"]] == ["high", "medium", "low"]
@@ -0,0 +1,135 @@
+# TodoEvolve Backend - Tests
+
+"""
+Unit tests for provider rate limiting (TokenBucket, CircuitBreaker).
+A fake clock drives time so state transitions are deterministic.
+"""
+
+import pytest
+
+from app.ai import ratelimit
+from app.ai.ratelimit import CircuitBreaker, TokenBucket, retry_after_seconds
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", fake)
+    return fake
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_empty(self, clock):
+        """A full bucket allows `capacity` requests, then refuses."""
+        bucket = TokenBucket(rate_per_minute=60)  # capacity 10
+        assert all(bucket.try_acquire() for _ in range(10))
+        assert bucket.try_acquire() is False
+
+    def test_refills_over_time(self, clock):
+        """Tokens come back at rate/60 per second."""
+        bucket = TokenBucket(rate_per_minute=60)
+        while bucket.try_acquire():
+            pass
+        clock.now += 1.0
+        assert bucket.try_acquire() is True
+        assert bucket.try_acquire() is False
+
+    def test_refill_capped_at_capacity(self, clock):
+        """Idle time never banks more than `capacity` tokens."""
+        bucket = TokenBucket(rate_per_minute=60)
+        clock.now += 3600
+        assert sum(bucket.try_acquire() for _ in range(20)) == 10
+
+    def test_slow_response_decreases_rate(self, clock):
+        """Latency above target cuts the rate multiplicatively."""
+        bucket = TokenBucket(rate_per_minute=60, beta=0.5, latency_target=3.0)
+        bucket.on_success(latency=5.0)
+        assert bucket.rate == 30
+
+    def test_fast_response_increases_rate_up_to_max(self, clock):
+        """Latency under target adds alpha, never past the configured rate."""
+        bucket = TokenBucket(rate_per_minute=60, alpha=1.0, beta=0.5)
+        bucket.on_throttle()
+        bucket.on_success(latency=0.5)
+        assert bucket.rate == 31
+        for _ in range(100):
+            bucket.on_success(latency=0.5)
+        assert bucket.rate == 60
+
+    def test_rate_never_below_minimum(self, clock):
+        """Repeated throttling stops at min_rate."""
+        bucket = TokenBucket(rate_per_minute=60, min_rate=5)
+        for _ in range(100):
+            bucket.on_throttle()
+        assert bucket.rate == 5
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold_failures(self, clock):
+        """Closed until `threshold` consecutive failures."""
+        breaker = CircuitBreaker(threshold=3, cooldown=30)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.is_open() is False
+        breaker.record_failure()
+        assert breaker.is_open() is True
+
+    def test_closes_after_cooldown(self, clock):
+        """An open breaker closes again once the cooldown has passed."""
+        breaker = CircuitBreaker(threshold=1, cooldown=30)
+        breaker.record_failure()
+        clock.now += 29
+        assert breaker.is_open() is True
+        clock.now += 2
+        assert breaker.is_open() is False
+
+    def test_success_resets(self, clock):
+        """A success closes the breaker and clears the failure count."""
+        breaker = CircuitBreaker(threshold=2, cooldown=30)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        assert breaker.is_open() is False
+        breaker.record_failure()
+        assert breaker.is_open() is False
+
+    def test_open_for_never_shortens(self, clock):
+        """open_for extends an open breaker but doesn't cut its cooldown."""
+        breaker = CircuitBreaker(threshold=1, cooldown=30)
+        breaker.record_failure()
+        breaker.open_for(5)
+        clock.now += 10
+        assert breaker.is_open() is True
+        breaker.open_for(60)
+        clock.now += 40
+        assert breaker.is_open() is True
+
+
+class TestRetryAfter:
+    """Tests for retry_after_seconds."""
+
+    def _error(self, headers):
+        response = type("Response", (), {"headers": headers})()
+        return type("Error", (Exception,), {"response": response})()
+
+    def test_numeric_header(self):
+        """A numeric Retry-After is returned in seconds."""
+        assert retry_after_seconds(self._error({"retry-after": "12"})) == 12.0
+
+    def test_missing_or_invalid_header(self):
+        """No usable header gives None."""
+        assert retry_after_seconds(self._error({})) is None
+        assert retry_after_seconds(self._error({"retry-after": "soon"})) is None
+        assert retry_after_seconds(Exception()) is None
@@ -6,6 +6,7 @@ Command-line interface for TodoEvolve.
 Implements interactive menu as per Phase I requirements.
 """
 
+import io
 import sys
 from typing import Optional
 from .task_manager import TaskManager, TaskNotFoundError
@@ -30,30 +31,76 @@ class TodoEvolveCLI:
 ║  6. 🚪 Exit                                                   ║
 ╚══════════════════════════════════════════════════════════════╝
 """
+    SEPARATOR = "-" * 50
+    # The menu never changes, so it is encoded once for UTF-8 terminals
+    _MENU_BYTES = (MENU + "\n").encode("utf-8")
+    # Indexed by task.completed (False -> 0, True -> 1)
+    STATUS_ICON = ("⏳", "✅")
+    STATUS_TEXT = ("[TODO]", "[DONE]")
     
     def __init__(self) -> None:
         """Initialize the CLI with a TaskManager."""
         self.manager = TaskManager()
         self.running = True
+        # Output for the current frame; written to stdout in one go by _flush
+        self._out = io.StringIO()
+        # Handlers bound once, indexed by menu number (slot 0 is unused)
+        self._actions = (
+            None,
+            self.add_task,
+            self.view_tasks,
+            self.delete_task,
+            self.update_task,
+            self.toggle_complete,
+            self.exit_app,
+        )
+    
+    def _emit(self, text: str = "") -> None:
+        """Queue a line of output for the current frame."""
+        self._out.write(text)
+        self._out.write("\n")
+    
+    def _flush(self) -> None:
+        """Write the queued frame to stdout and reset the buffer."""
+        out = self._out
+        if out.tell():
+            sys.stdout.write(out.getvalue())
+            out.seek(0)
+            out.truncate(0)
+        sys.stdout.flush()
     
     def clear_line(self) -> None:
         """Print a visual separator."""
-        print("-" * 50)
+        self._emit(self.SEPARATOR)
     
     def display_menu(self) -> None:
-        """Show the main menu."""
-        print(self.MENU)
+        """Show the main menu (menu, stats and separator in a single write)."""
         stats = f"📊 Total: {self.manager.count()} | ✅ Done: {self.manager.count_completed()} | ⏳ Pending: {self.manager.count_pending()}"
-        print(stats)
-        self.clear_line()
+        tail = f"{stats}\n{self.SEPARATOR}\n"
+        self._flush()  # the previous frame goes out before the menu
+        out = sys.stdout
+        buffer = getattr(out, "buffer", None)
+        if buffer is not None and (out.encoding or "").lower().replace("-", "") == "utf8":
+            buffer.write(self._MENU_BYTES)
+            buffer.write(tail.encode("utf-8"))
+            buffer.flush()
+        else:
+            out.write(f"{self.MENU}\n{tail}")
+            out.flush()
     
     def get_input(self, prompt: str) -> str:
-        """Get user input with prompt."""
+        """Get user input with prompt (the frame so far is flushed with it, so it always shows)."""
+        self._out.write(prompt)
+        self._flush()
         try:
-            return input(prompt).strip()
-        except (EOFError, KeyboardInterrupt):
-            print("\n\n👋 Goodbye!")
+            line = sys.stdin.readline()
+        except KeyboardInterrupt:
+            line = ""
+        if not line:  # EOF or Ctrl+C
+            self._emit("\n\n👋 Goodbye!")
+            self._flush()
             sys.exit(0)
+        return line.strip()
     
     def get_task_id(self) -> Optional[int]:
         """Get and validate a task ID from user."""
@@ -61,55 +108,59 @@ class TodoEvolveCLI:
         try:
             return int(id_str)
         except ValueError:
-            print("\n❌ Error: Please enter a valid task ID (number)")
+            self._emit("\n❌ Error: Please enter a valid task ID (number)")
             return None
     
     def add_task(self) -> None:
         """Handle adding a new task."""
-        print("\n➕ ADD NEW TASK")
+        self._emit("\n➕ ADD NEW TASK")
         self.clear_line()
         
         title = self.get_input("Title (required): ")
         if not title:
-            print("\n❌ Error: Title is required")
+            self._emit("\n❌ Error: Title is required")
             return
         
         description = self.get_input("Description (optional, press Enter to skip): ")
         
         try:
             task = self.manager.add_task(title, description)
-            print(f"\n✅ Task created successfully!")
-            print(f"   ID: {task.id}")
-            print(f"   Title: {task.title}")
+            self._emit(f"\n✅ Task created successfully!")
+            self._emit(f"   ID: {task.id}")
+            self._emit(f"   Title: {task.title}")
             if task.description:
-                print(f"   Description: {task.description}")
+                self._emit(f"   Description: {task.description}")
         except ValueError as e:
-            print(f"\n❌ {e}")
+            self._emit(f"\n❌ {e}")
     
     def view_tasks(self) -> None:
         """Handle viewing all tasks."""
-        print("\n📋 YOUR TASKS")
+        self._emit("\n📋 YOUR TASKS")
         self.clear_line()
         
         tasks = self.manager.list_tasks()
         
         if not tasks:
-            print("📭 No tasks yet. Add your first task!")
+            self._emit("📭 No tasks yet. Add your first task!")
             return
         
+        emit = self._emit
         for task in tasks:
-            status_icon = "✅" if task.completed else "⏳"
-            status_text = "[DONE]" if task.completed else "[TODO]"
-            print(f"  {task.id}. {status_icon} {status_text} {task.title}")
-            if task.description:
-                print(f"      └─ {task.description[:50]}{'...' if len(task.description) > 50 else ''}")
+            done = task.completed
+            emit(f"  {task.id}. {self.STATUS_ICON[done]} {self.STATUS_TEXT[done]} {task.title}")
+            desc = task.description
+            if desc:
+                if len(desc) > 50:
+                    emit(f"      └─ {desc[:50]}...")
+                else:
+                    emit(f"      └─ {desc}")
         
-        self.clear_line()
-        print(f"Total: {len(tasks)} task(s)")
+        emit(self.SEPARATOR)
+        emit(f"Total: {len(tasks)} task(s)")
     
     def delete_task(self) -> None:
         """Handle deleting a task."""
-        print("\n🗑️  DELETE TASK")
+        self._emit("\n🗑️  DELETE TASK")
         self.clear_line()
         
         task_id = self.get_task_id()
@@ -118,13 +169,13 @@ class TodoEvolveCLI:
         
         try:
             task = self.manager.delete_task(task_id)
-            print(f"\n✅ Task deleted: '{task.title}'")
+            self._emit(f"\n✅ Task deleted: '{task.title}'")
         except TaskNotFoundError as e:
-            print(f"\n❌ {e}")
+            self._emit(f"\n❌ {e}")
     
     def update_task(self) -> None:
         """Handle updating a task."""
-        print("\n✏️  UPDATE TASK")
+        self._emit("\n✏️  UPDATE TASK")
         self.clear_line()
         
         task_id = self.get_task_id()
@@ -133,8 +184,8 @@ class TodoEvolveCLI:
         
         try:
             current_task = self.manager.get_task(task_id)
-            print(f"Current title: {current_task.title}")
-            print(f"Current description: {current_task.description or '(none)'}")
+            self._emit(f"Current title: {current_task.title}")
+            self._emit(f"Current description: {current_task.description or '(none)'}")
             self.clear_line()
             
             new_title = self.get_input("New title (press Enter to keep current): ")
@@ -145,17 +196,17 @@ class TodoEvolveCLI:
                 title=new_title if new_title else None,
                 description=new_desc if new_desc else None
             )
-            print(f"\n✅ Task updated successfully!")
-            print(f"   Title: {task.title}")
-            print(f"   Description: {task.description or '(none)'}")
+            self._emit(f"\n✅ Task updated successfully!")
+            self._emit(f"   Title: {task.title}")
+            self._emit(f"   Description: {task.description or '(none)'}")
         except TaskNotFoundError as e:
-            print(f"\n❌ {e}")
+            self._emit(f"\n❌ {e}")
         except ValueError as e:
-            print(f"\n❌ {e}")
+            self._emit(f"\n❌ {e}")
     
     def toggle_complete(self) -> None:
         """Handle toggling task completion."""
-        print("\n✅ TOGGLE COMPLETE")
+        self._emit("\n✅ TOGGLE COMPLETE")
         self.clear_line()
         
         task_id = self.get_task_id()
@@ -165,42 +216,40 @@ class TodoEvolveCLI:
         try:
             task = self.manager.toggle_complete(task_id)
             status = "completed ✅" if task.completed else "pending ⏳"
-            print(f"\n✅ Task '{task.title}' marked as {status}")
+            self._emit(f"\n✅ Task '{task.title}' marked as {status}")
         except TaskNotFoundError as e:
-            print(f"\n❌ {e}")
+            self._emit(f"\n❌ {e}")
     
     def exit_app(self) -> None:
         """Handle exiting the application."""
-        print("\n👋 Thank you for using TodoEvolve! Goodbye!")
+        self._emit("\n👋 Thank you for using TodoEvolve! Goodbye!")
         self.running = False
     
     def run(self) -> None:
         """Main application loop."""
-        print("\n" + "=" * 50)
-        print("   Welcome to TodoEvolve!")
-        print("   Smart Multilingual Productivity Assistant")
-        print("=" * 50)
-        
-        actions = {
-            "1": self.add_task,
-            "2": self.view_tasks,
-            "3": self.delete_task,
-            "4": self.update_task,
-            "5": self.toggle_complete,
-            "6": self.exit_app,
-        }
+        self._emit("\n" + "=" * 50)
+        self._emit("   Welcome to TodoEvolve!")
+        self._emit("   Smart Multilingual Productivity Assistant")
+        self._emit("=" * 50)
         
         while self.running:
             self.display_menu()
             choice = self.get_input("Enter choice (1-6): ")
             
-            if choice in actions:
-                actions[choice]()
+            try:
+                index = int(choice)
+            except ValueError:
+                index = 0
+            action = self._actions[index] if 0 < index < len(self._actions) else None
+            if action is not None:
+                action()
                 if self.running:
-                    print()
+                    self._emit()
                     self.get_input("Press Enter to continue...")
             else:
-                print("\n❌ Error: Please enter a valid option (1-6)")
+                self._emit("\n❌ Error: Please enter a valid option (1-6)")
+        
+        self._flush()
 
 
 def main() -> None:
@@ -8,10 +8,11 @@ Implements US-001 through US-005 data requirements.
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from time import time
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """
     Represents a single task in the TodoEvolve system.
@@ -21,29 +22,33 @@ class Task:
         title: Required task title (1-200 characters)
         description: Optional task description (max 1000 characters)
         completed: Task completion status (default: False)
-        created_at: Timestamp of task creation
+        created_at: Creation time as a Unix timestamp (formatted in to_dict)
     """
     id: int
     title: str
     description: str = ""
     completed: bool = False
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: float = field(default_factory=time)
+    # ISO form of created_at, filled in on first serialization
+    _created_at_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self) -> None:
         """Validate task data after initialization."""
-        self._validate_title()
-        self._validate_description()
+        self._validate_title(self.title)
+        self._validate_description(self.description)
     
-    def _validate_title(self) -> None:
+    @staticmethod
+    def _validate_title(title: str) -> None:
         """Ensure title meets requirements."""
-        if not self.title or not self.title.strip():
+        if not title or not title.strip():
             raise ValueError("Error: Title is required")
-        if len(self.title) > 200:
+        if len(title) > 200:
             raise ValueError("Error: Title must be 200 characters or less")
     
-    def _validate_description(self) -> None:
+    @staticmethod
+    def _validate_description(description: str) -> None:
         """Ensure description meets requirements."""
-        if len(self.description) > 1000:
+        if len(description) > 1000:
             raise ValueError("Error: Description must be 1000 characters or less")
     
     def toggle_complete(self) -> bool:
@@ -63,13 +68,25 @@ class Task:
         Args:
             title: New title (optional)
             description: New description (optional)
+        
+        Both values are validated before either is assigned, so a rejected
+        update leaves the task unchanged. A value that is the current string
+        object has already been validated and is skipped.
         """
+        if title is self.title:
+            title = None
+        if description is self.description:
+            description = None
+        
+        if title is not None:
+            self._validate_title(title)
+        if description is not None:
+            self._validate_description(description)
+        
         if title is not None:
             self.title = title
-            self._validate_title()
         if description is not None:
             self.description = description
-            self._validate_description()
     
     def __str__(self) -> str:
         """String representation for display."""
@@ -78,10 +95,13 @@ class Task:
     
     def to_dict(self) -> dict:
         """Convert task to dictionary for serialization."""
+        created_at_iso = self._created_at_iso
+        if created_at_iso is None:
+            created_at_iso = self._created_at_iso = datetime.fromtimestamp(self.created_at).isoformat()
         return {
             "id": self.id,
             "title": self.title,
             "description": self.description,
             "completed": self.completed,
-            "created_at": self.created_at.isoformat()
+            "created_at": created_at_iso
         }
@@ -6,13 +6,21 @@ TaskManager handles all CRUD operations for tasks.
 Implements in-memory storage as per Phase I requirements.
 """
 
-from typing import Dict, List, Optional
+import sys
+from typing import Dict, List, Optional, Set
 from .models import Task
 
 
 class TaskNotFoundError(Exception):
     """Raised when a task with the given ID is not found."""
-    pass
+    
+    def __init__(self, task_id: int) -> None:
+        super().__init__(task_id)
+        self.task_id = task_id
+    
+    def __str__(self) -> str:
+        # Formatted only when shown, not on every miss
+        return f"Error: Task with ID {self.task_id} not found"
 
 
 class TaskManager:
@@ -31,6 +39,10 @@ class TaskManager:
         """Initialize the task manager with empty storage."""
         self._tasks: Dict[int, Task] = {}
         self._next_id: int = 1
+        # Task ids by status, maintained by add/delete/toggle: filtered listing
+        # touches only matching tasks and the menu's counts are O(1)
+        self._completed_ids: Set[int] = set()
+        self._pending_ids: Set[int] = set()
     
     def add_task(self, title: str, description: str = "") -> Task:
         """
@@ -46,12 +58,15 @@ class TaskManager:
         Raises:
             ValueError: If title is empty or too long.
         """
+        # Interned so tasks with repeated titles/descriptions share one string
+        description = description.strip()
         task = Task(
             id=self._next_id,
-            title=title.strip(),
-            description=description.strip()
+            title=sys.intern(title.strip()),
+            description=sys.intern(description) if description else description
         )
         self._tasks[task.id] = task
+        self._pending_ids.add(task.id)
         self._next_id += 1
         return task
     
@@ -68,9 +83,10 @@ class TaskManager:
         Raises:
             TaskNotFoundError: If task with given ID doesn't exist.
         """
-        if task_id not in self._tasks:
-            raise TaskNotFoundError(f"Error: Task with ID {task_id} not found")
-        return self._tasks[task_id]
+        task = self._tasks.get(task_id)
+        if task is None:
+            raise TaskNotFoundError(task_id)
+        return task
     
     def list_tasks(self, status_filter: Optional[str] = None) -> List[Task]:
         """
@@ -80,16 +96,16 @@ class TaskManager:
             status_filter: 'completed', 'pending', or None for all.
         
         Returns:
-            List of Task objects matching the filter.
+            List of Task objects matching the filter, in ascending id order.
         """
-        tasks = list(self._tasks.values())
-        
         if status_filter == "completed":
-            tasks = [t for t in tasks if t.completed]
-        elif status_filter == "pending":
-            tasks = [t for t in tasks if not t.completed]
+            return [self._tasks[i] for i in sorted(self._completed_ids)]
+        if status_filter == "pending":
+            return [self._tasks[i] for i in sorted(self._pending_ids)]
         
-        return sorted(tasks, key=lambda t: t.id)
+        # No sort needed: ids only ever come from _next_id, so dict insertion
+        # order is id order (deletes leave gaps but never reorder)
+        return list(self._tasks.values())
     
     def update_task(
         self, 
@@ -134,6 +150,8 @@ class TaskManager:
         """
         task = self.get_task(task_id)
         del self._tasks[task_id]
+        self._completed_ids.discard(task_id)
+        self._pending_ids.discard(task_id)
         return task
     
     def toggle_complete(self, task_id: int) -> Task:
@@ -150,7 +168,12 @@ class TaskManager:
             TaskNotFoundError: If task doesn't exist.
         """
         task = self.get_task(task_id)
-        task.toggle_complete()
+        if task.toggle_complete():
+            self._pending_ids.discard(task_id)
+            self._completed_ids.add(task_id)
+        else:
+            self._completed_ids.discard(task_id)
+            self._pending_ids.add(task_id)
         return task
     
     def count(self) -> int:
@@ -159,8 +182,8 @@ class TaskManager:
     
     def count_completed(self) -> int:
         """Return the number of completed tasks."""
-        return sum(1 for t in self._tasks.values() if t.completed)
+        return len(self._completed_ids)
     
     def count_pending(self) -> int:
         """Return the number of pending tasks."""
-        return sum(1 for t in self._tasks.values() if not t.completed)
+        return len(self._pending_ids)
@@ -7,6 +7,7 @@ Tests all CRUD operations and edge cases.
 """
 
 import pytest
+from datetime import datetime
 from src.models import Task
 from src.task_manager import TaskManager, TaskNotFoundError
 
@@ -67,6 +68,20 @@ class TestTask:
         task.update(description="New description")
         assert task.description == "New description"
     
+    def test_rejected_update_leaves_task_unchanged(self):
+        """A failed update doesn't apply any of its fields."""
+        task = Task(id=1, title="Original", description="Desc")
+        with pytest.raises(ValueError, match="1000 characters"):
+            task.update(title="New", description="x" * 1001)
+        assert task.title == "Original"
+        assert task.description == "Desc"
+    
+    def test_to_dict_formats_created_at(self):
+        """to_dict renders the creation time as an ISO 8601 string."""
+        task = Task(id=1, title="Test")
+        created = datetime.fromisoformat(task.to_dict()["created_at"])
+        assert abs(created.timestamp() - task.created_at) < 1e-3
+    
     def test_str_representation(self):
         """String representation includes status and title."""
         task = Task(id=1, title="Test")
@@ -111,8 +126,9 @@ class TestTaskManager:
     
     def test_get_nonexistent_task(self, manager):
         """Getting nonexistent task raises error."""
-        with pytest.raises(TaskNotFoundError):
+        with pytest.raises(TaskNotFoundError, match="Error: Task with ID 999 not found") as exc_info:
             manager.get_task(999)
+        assert exc_info.value.task_id == 999
     
     def test_list_tasks_empty(self, manager):
         """List returns empty list when no tasks."""
@@ -145,6 +161,18 @@ class TestTaskManager:
         assert len(pending) == 1
         assert pending[0].title == "Task 2"
     
+    def test_list_tasks_in_id_order(self, manager):
+        """Listing stays in id order after deletes and status changes."""
+        ids = [manager.add_task(f"Task {i}").id for i in range(5)]
+        manager.delete_task(ids[1])
+        manager.toggle_complete(ids[4])
+        manager.toggle_complete(ids[0])
+        manager.toggle_complete(ids[4])
+        
+        assert [t.id for t in manager.list_tasks()] == [ids[0], ids[2], ids[3], ids[4]]
+        assert [t.id for t in manager.list_tasks("pending")] == [ids[2], ids[3], ids[4]]
+        assert [t.id for t in manager.list_tasks("completed")] == [ids[0]]
+    
     def test_update_task(self, manager):
         """Can update task title and description."""
         task = manager.add_task("Original", "Old desc")
@@ -191,3 +219,18 @@ class TestTaskManager:
         assert manager.count() == 3
         assert manager.count_completed() == 1
         assert manager.count_pending() == 2
+    
+    def test_counts_follow_toggle_and_delete(self, manager):
+        """Counts stay correct when tasks are re-opened or deleted."""
+        t1 = manager.add_task("Task 1")
+        t2 = manager.add_task("Task 2")
+        manager.toggle_complete(t1.id)
+        manager.toggle_complete(t2.id)
+        manager.toggle_complete(t2.id)
+        
+        assert manager.count_completed() == 1
+        assert manager.count_pending() == 1
+        
+        manager.delete_task(t1.id)
+        assert manager.count_completed() == 0
+        assert manager.count_pending() == 1